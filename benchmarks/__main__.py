@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark suite of generators and solvers.
+
+Run from the root of the repository with:
+    python -m benchmarks run [-o RESULTS] [-s SIZE [SIZE ...]] [-r REPEAT]
+    python -m benchmarks compare BASELINE CURRENT [-t THRESHOLD]
+"""
+
+import argparse
+import sys
+
+from .suite import DEFAULT_SIZES, run, compare, save_results, load_results
+
+
+def _print_records(results):
+    print(f"{'startup':<36} {'seconds':>10}")
+    for record in results['startup']:
+        print(f"{record['command']:<36} {record['seconds']:>10.5f}")
+
+    print()
+    print(f"{'generator':<36} {'size':>11} {'seconds':>10} {'peak MB':>9} {'cells/sec':>12}")
+    for record in results['generators']:
+        print(f"{record['algorithm']:<36} {record['rows']:>5}x{record['cols']:<5} {record['seconds']:>10.5f} "
+              f"{record['peak_memory_bytes'] / 2**20:>9.2f} {record['cells_per_second']:>12.0f}")
+
+    print()
+    print(f"{'solver':<36} {'size':>11} {'seconds':>10} {'peak MB':>9} {'expanded':>10} {'cells/sec':>12}")
+    for record in results['solvers']:
+        print(f"{record['algorithm']:<36} {record['rows']:>5}x{record['cols']:<5} {record['seconds']:>10.5f} "
+              f"{record['peak_memory_bytes'] / 2**20:>9.2f} {record['nodes_expanded']:>10} {record['cells_per_second']:>12.0f}")
+
+
+def _print_comparisons(comparisons):
+    print(f"{'kind':<10} {'name':<48} {'metric':<18} {'baseline':>12} {'current':>12} {'ratio':>7}")
+    for kind, name, metric, baseline_value, current_value, ratio, regressed in comparisons:
+        print(f"{kind:<10} {name:<48} {metric:<18} {baseline_value:>12.5g} {current_value:>12.5g} "
+              f"{ratio:>6.2f}x{'  REGRESSION' if regressed else ''}")
+
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = 'Benchmark suite of maze generators and solvers.')
+    subparsers = parser.add_subparsers(dest = 'command', required = True)
+
+    run_parser = subparsers.add_parser('run', help = 'Run every generator and solver and record results.')
+    run_parser.add_argument('--output', '-o', type = str, default = 'benchmark_results.json', required = False,
+                            help = 'JSON file in which results are saved.')
+    run_parser.add_argument('--sizes', '-s', type = int, nargs = '+', default = DEFAULT_SIZES, required = False,
+                            help = 'Number of rows and columns of the square mazes generated and solved.')
+    run_parser.add_argument('--repeat', '-r', type = int, default = 3, required = False,
+                            help = 'Number of timed runs per combination, of which the fastest is kept.')
+
+    compare_parser = subparsers.add_parser('compare', help = 'Compare two result files and flag regressions.')
+    compare_parser.add_argument('baseline', type = str, help = 'JSON results used as reference.')
+    compare_parser.add_argument('current', type = str, help = 'JSON results checked against reference.')
+    compare_parser.add_argument('--threshold', '-t', type = float, default = 0.1, required = False,
+                                help = 'Fraction by which a metric may exceed its reference before it is flagged as a regression.')
+
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        if args.repeat < 1 or any(size < 2 for size in args.sizes):
+            raise ValueError("Repeat must be positive and sizes must be at least 2.")
+
+        results = run(args.sizes, args.repeat)
+        _print_records(results)
+        save_results(results, args.output)
+
+    else:
+        comparisons = compare(load_results(args.baseline), load_results(args.current), args.threshold)
+        _print_comparisons(comparisons)
+
+        # A non zero exit status lets regressions fail automated checks.
+        if any(regressed for *_, regressed in comparisons):
+            sys.exit(1)
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark comparing the number of nodes expanded by unidirectional and bidirectional solvers on maze images.
+
+Run from the root of the repository with:
+    python -m benchmarks.bidirectional [-i IMAGE [IMAGE ...]]
+"""
+
+import argparse
+from time import perf_counter
+
+from solvers import AStar, BreadthFirstSearch, BidirectionalAStar, BidirectionalBreadthFirstSearch, PriorityQueue
+
+from .priority_queues import DEFAULT_IMAGES, _load_maze
+
+
+# Pairs of unidirectional solver and its bidirectional variant.
+SOLVER_PAIRS = [(lambda: BreadthFirstSearch(), lambda: BidirectionalBreadthFirstSearch(), 'breadth_first_search'),
+                (lambda: AStar(PriorityQueue.BINARY_HEAP), lambda: BidirectionalAStar(PriorityQueue.BINARY_HEAP), 'a_star')]
+
+
+def benchmark_bidirectional(image_paths):
+    """
+    Function running each solver and its bidirectional variant on each image. Returns a list of
+    (image, algorithm, nodes expanded, bidirectional nodes expanded, seconds, bidirectional seconds) tuples.
+    """
+
+    results = []
+
+    for image_path in image_paths:
+        array, start, end = _load_maze(image_path)
+
+        for unidirectional, bidirectional, name in SOLVER_PAIRS:
+            measures = []
+            for solver in (unidirectional(), bidirectional()):
+                start_time = perf_counter()
+                solver._solve_implementation(array, start, end)
+                measures.append((solver.nodes_expanded, perf_counter() - start_time, len(solver.solution)))
+
+            (nodes, seconds, length), (bidirectional_nodes, bidirectional_seconds, bidirectional_length) = measures
+            if length != bidirectional_length:
+                raise AssertionError(f'Path lengths differ on {image_path} for {name}: {length} != {bidirectional_length}')
+
+            results.append((image_path, name, nodes, bidirectional_nodes, seconds, bidirectional_seconds))
+
+    return results
+
+
+def _print_results(results):
+    print(f"{'image':<24} {'algorithm':<22} {'expanded':>10} {'bidirectional':>14} {'reduction':>10} {'seconds':>10} {'bidirectional':>14}")
+    for image, name, nodes, bidirectional_nodes, seconds, bidirectional_seconds in results:
+        reduction = 100 * (1 - bidirectional_nodes / nodes)
+        print(f"{image:<24} {name:<22} {nodes:>10} {bidirectional_nodes:>14} {reduction:>9.1f}% {seconds:>10.5f} {bidirectional_seconds:>14.5f}")
+
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = 'Benchmark of nodes expanded by unidirectional and bidirectional solvers.')
+    parser.add_argument('--images', '-i', type = str, nargs = '+', default = DEFAULT_IMAGES, required = False,
+                        help = 'Maze images on which solvers are run.')
+
+    args = parser.parse_args()
+
+    _print_results(benchmark_bidirectional(args.images))
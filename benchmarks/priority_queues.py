@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark comparing the priority queues usable by A* and Dijkstra on maze images.
+
+Run from the root of the repository with:
+    python -m benchmarks.priority_queues [-i IMAGE [IMAGE ...]] [-r REPEAT]
+"""
+
+import argparse
+from time import perf_counter
+
+from PIL import Image
+
+from solvers import AStar, Dijkstra, PriorityQueue
+
+
+DEFAULT_IMAGES = ['examples/small.png', 'examples/medium.png', 'examples/large.png']
+
+
+def _load_maze(image_path):
+    """
+    Function decoding a maze image once, so that only the search itself is timed.
+    """
+
+    solver = AStar()
+    image = Image.open(image_path).convert('RGB')
+    colors = solver._analyse_image_colors(image)
+
+    return solver._image_to_array(image, colors)
+
+
+def benchmark_priority_queues(image_paths, repeat):
+    """
+    Function timing the search of each solver with each priority queue on each image, keeping the
+    best time out of repeat runs. Returns a list of (image, solver, queue, seconds) tuples.
+    """
+
+    results = []
+
+    for image_path in image_paths:
+        array, start, end = _load_maze(image_path)
+
+        for solver_class in (AStar, Dijkstra):
+            for priority_queue_type in PriorityQueue:
+                solver = solver_class(priority_queue_type)
+
+                timings = []
+                for _ in range(repeat):
+                    start_time = perf_counter()
+                    solver._solve_implementation(array, start, end)
+                    timings.append(perf_counter() - start_time)
+
+                results.append((image_path, solver_class.__name__, priority_queue_type.name, min(timings)))
+
+    return results
+
+
+def _print_results(results):
+    reference = {(image, solver): seconds for image, solver, queue, seconds in results if queue == PriorityQueue.BINARY_HEAP.name}
+
+    print(f"{'image':<24} {'solver':<10} {'queue':<28} {'seconds':>10} {'vs binary heap':>15}")
+    for image, solver, queue, seconds in results:
+        print(f"{image:<24} {solver:<10} {queue:<28} {seconds:>10.5f} {reference[(image, solver)] / seconds:>14.2f}x")
+
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = 'Benchmark of priority queues used by A* and Dijkstra solvers.')
+    parser.add_argument('--images', '-i', type = str, nargs = '+', default = DEFAULT_IMAGES, required = False,
+                        help = 'Maze images on which solvers are run.')
+    parser.add_argument('--repeat', '-r', type = int, default = 3, required = False,
+                        help = 'Number of runs per combination, of which the fastest is kept.')
+
+    args = parser.parse_args()
+
+    _print_results(benchmark_priority_queues(args.images, args.repeat))
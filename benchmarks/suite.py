@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark suite timing startup of the scripts, sweeping every generator over a ladder of maze sizes and every
+solver over fixed seed mazes, recording wall time, peak memory, nodes expanded and cells/sec, and comparing
+results between two runs.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import tracemalloc
+from datetime import datetime, timezone
+from time import perf_counter
+
+import numpy as np
+
+from generators import GENERATOR_ALGORITHMS, get_generator_constructor
+from solvers import SOLVER_ALGORITHMS, get_solver_constructor
+
+
+DEFAULT_SIZES = [50, 150, 300]
+
+# Generator and seed of the mazes on which solvers are run.
+SOLVER_MAZE_ALGORITHM = 'random_kruskal'
+SEED = 1234
+
+# Commands whose startup time is measured, run from the root of the repository.
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STARTUP_COMMANDS = {'import generators, solvers': [sys.executable, '-c', 'import generators, solvers'],
+                    'generate.py --help'        : [sys.executable, 'generate.py', '--help'],
+                    'solve.py --help'           : [sys.executable, 'solve.py', '--help']}
+
+# Metrics compared between two runs, for which higher values are worse.
+COMPARED_METRICS = ['seconds', 'peak_memory_bytes']
+
+# Fields identifying the records of each kind across runs.
+KEY_FIELDS = {'startup'   : ('command',),
+              'generators': ('algorithm', 'rows', 'cols'),
+              'solvers'   : ('algorithm', 'rows', 'cols')}
+
+
+def _measure(function, repeat):
+    """
+    Function running function repeat times and once more under tracemalloc, which slows it down.
+    Returns the fastest time of the timed runs, the peak memory of the traced run, and the last result.
+    """
+
+    timings = []
+    for _ in range(repeat):
+        start_time = perf_counter()
+        result = function()
+        timings.append(perf_counter() - start_time)
+
+    tracemalloc.start()
+    try:
+        function()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return min(timings), peak_memory, result
+
+
+def benchmark_startup(repeat):
+    """
+    Function timing each startup command in a new interpreter, keeping the fastest of repeat runs.
+    Returns a list of records.
+    """
+
+    records = []
+
+    for command, arguments in STARTUP_COMMANDS.items():
+        timings = []
+        for _ in range(repeat):
+            start_time = perf_counter()
+            subprocess.run(arguments, cwd = ROOT_DIRECTORY, check = True, stdout = subprocess.DEVNULL)
+            timings.append(perf_counter() - start_time)
+
+        records.append({'command': command, 'seconds': min(timings)})
+
+    return records
+
+
+def benchmark_generators(sizes, repeat, algorithms = GENERATOR_ALGORITHMS):
+    """
+    Function timing generation of a square maze of each size with each algorithm. Returns a list of records.
+    """
+
+    records = []
+
+    for size in sizes:
+        for algorithm in algorithms:
+            generate = lambda: get_generator_constructor(algorithm)((size, size), (0, 0), (size-1, size-1), SEED).generate(verbose = False)
+            seconds, peak_memory, _ = _measure(generate, repeat)
+
+            records.append({'algorithm': algorithm, 'rows': size, 'cols': size, 'seconds': seconds,
+                            'peak_memory_bytes': peak_memory, 'cells_per_second': size * size / seconds})
+
+    return records
+
+
+def benchmark_solvers(sizes, repeat, algorithms = SOLVER_ALGORITHMS):
+    """
+    Function timing search of each algorithm on a fixed seed square maze of each size, from its top left to its
+    bottom right cell. Loading the maze is not timed. Returns a list of records.
+    """
+
+    records = []
+
+    for size in sizes:
+        generator = get_generator_constructor(SOLVER_MAZE_ALGORITHM)((size, size), (0, 0), (size-1, size-1), SEED).generate(verbose = False)
+
+        for algorithm in algorithms:
+            solver = get_solver_constructor(algorithm)()
+            array, start, end = solver._load_map(generator.map, generator.start, generator.end)
+
+            solve = lambda: solver._solve_implementation(array, start, end)
+            seconds, peak_memory, _ = _measure(solve, repeat)
+
+            records.append({'algorithm': algorithm, 'maze': SOLVER_MAZE_ALGORITHM, 'rows': array.shape[0], 'cols': array.shape[1],
+                            'seconds': seconds, 'peak_memory_bytes': peak_memory, 'nodes_expanded': solver.nodes_expanded,
+                            'cells_per_second': array.size / seconds})
+
+    return records
+
+
+def run(sizes = DEFAULT_SIZES, repeat = 3, generator_algorithms = GENERATOR_ALGORITHMS, solver_algorithms = SOLVER_ALGORITHMS):
+    """
+    Function running the whole suite, and returning its results along with a description of the environment.
+    """
+
+    return {'environment': {'python': sys.version.split()[0], 'numpy': np.__version__, 'platform': platform.platform(),
+                            'date': datetime.now(timezone.utc).isoformat(timespec = 'seconds')},
+            'seed': SEED,
+            'repeat': repeat,
+            'startup': benchmark_startup(repeat),
+            'generators': benchmark_generators(sizes, repeat, generator_algorithms),
+            'solvers': benchmark_solvers(sizes, repeat, solver_algorithms)}
+
+
+def compare(baseline, current, threshold):
+    """
+    Function comparing the records of two runs of the suite. Returns a list of (kind, name, metric, baseline value,
+    current value, ratio, regressed) tuples, where regressed tells whether the current value exceeds the baseline one
+    by more than the threshold fraction. Records missing from either run are skipped.
+    """
+
+    comparisons = []
+
+    for kind, key_fields in KEY_FIELDS.items():
+        baseline_records = {tuple(record[field] for field in key_fields): record for record in baseline.get(kind, [])}
+
+        for record in current.get(kind, []):
+            key = tuple(record[field] for field in key_fields)
+            if key not in baseline_records:
+                continue
+
+            name = record['command'] if kind == 'startup' else f"{record['algorithm']} {record['rows']}x{record['cols']}"
+
+            for metric in COMPARED_METRICS:
+                if metric not in record:
+                    continue
+
+                baseline_value, current_value = baseline_records[key][metric], record[metric]
+                ratio = current_value / baseline_value if baseline_value else float('inf')
+                comparisons.append((kind, name, metric, baseline_value, current_value, ratio, ratio > 1 + threshold))
+
+    return comparisons
+
+
+def save_results(results, path):
+    with open(path, 'w') as file:
+        json.dump(results, file, indent = 2)
+
+
+def load_results(path):
+    with open(path) as file:
+        return json.load(file)
@@ -1,10 +1,40 @@
 # -*- coding: utf-8 -*-
 
 import argparse
+import os
 import random
-from time import time_ns
+from time import time, time_ns
 
 from generators import GENERATOR_ALGORITHMS, get_generator_constructor
+from metrics import MetricsCollector, JsonLinesSink, print_sink
+from solvers import SOLVER_ALGORITHMS, get_solver_constructor
+
+
+def _random_start(dimention):
+    """
+    Function sampling a random start position uniformly in the maze.
+    """
+
+    return tuple(random.randrange(elem) for elem in dimention)
+
+
+def _random_end(dimention, start):
+    """
+    Function sampling a random end position, weighting the probability by distance from start position.
+    """
+
+    weight_func = lambda row, col, start_row, start_col: (abs(start_row - row) + abs(start_col - col))**2
+
+    n_rows, n_cols = dimention
+    start_row, start_col = start
+
+    # Rejection sampling is used to avoid building a list of all cells on huge mazes: a uniformly
+    # sampled cell is accepted with probability proportional to its weight.
+    max_weight = weight_func(max(start_row, n_rows - 1 - start_row), max(start_col, n_cols - 1 - start_col), 0, 0)
+    while True:
+        row, col = random.randrange(n_rows), random.randrange(n_cols)
+        if random.random() * max_weight < weight_func(row, col, start_row, start_col):
+            return (row, col)
 
 
 def _check_args(args):
@@ -12,10 +42,16 @@ def _check_args(args):
     Function checking validity of program parameters and applying default to unspecified arguments.
     """
 
-    # Default values for program arguments and definition of function used to generate random weights distribution.
+    # Seed random module first so that all random choices below are reproducible.
+    if args.seed is not None:
+        if not 0 <= args.seed < 2**64:
+            raise ValueError("Seed must be a non-negative integer smaller than 2**64.")
+
+        random.seed(args.seed)
+
+    # Default values for program arguments.
     default_dimention = (50, 50)
     min_side_dimention = 2
-    weight_func = lambda row, col, start_row, start_col: (abs(start_row - row) + abs(start_col - col))**2
 
     # Check of dimention argument.
     if args.dimention is None:
@@ -26,10 +62,27 @@ def _check_args(args):
         
         elif any(elem < min_side_dimention for elem in args.dimention):
             raise ValueError(f"Dimention of maze must be at least {min_side_dimention}x{min_side_dimention}.")
+
+    # Check of max dimention argument.
+    if args.max_dimention is not None:
+        if len(args.max_dimention) != len(default_dimention):
+            raise ValueError("Wrong number of integers provided for max dimention. Expected two integers: rows, columns.")
+
+        elif any(max_elem < elem for max_elem, elem in zip(args.max_dimention, args.dimention)):
+            raise ValueError("Max dimention of maze must be at least as large as dimention.")
+
+    # Check of count argument.
+    if args.count is not None and args.count < 1:
+        raise ValueError("Number of mazes to generate must be positive.")
+
+    # In single maze mode, a dimention is sampled right away. In batch mode, it is sampled for each maze.
+    if args.count is None and args.max_dimention is not None:
+        args.dimention = tuple(random.randint(low, high) for low, high in zip(args.dimention, args.max_dimention))
         
-    # Check of dimention argument.
+    # Check of start argument. Explicit start must be inside the smallest maze which can be generated.
     if args.start is None:
-        args.start = tuple(random.randrange(elem) for elem in args.dimention)
+        if args.count is None:
+            args.start = _random_start(args.dimention)
     else:
         if len(args.start) != len(default_dimention):
             raise ValueError("Wrong number of integers provided for start. Expected two integers: row, column.")
@@ -39,13 +92,8 @@ def _check_args(args):
 
     # Check of end argument.
     if args.end is None:
-        n_rows, n_cols = args.dimention
-        start_row, start_col = args.start
-
-        # Randomly sample a end poisition weighting the probability by distance from start position. 
-        coords  = [(row, col) for row in range(n_rows) for col in range(n_cols)]
-        weights = [weight_func(row, col, start_row, start_col) for row, col in coords]
-        args.end, = random.choices(coords, weights, k = 1)
+        if args.count is None:
+            args.end = _random_end(args.dimention, args.start)
     else:
         if len(args.end) != len(default_dimention):
             raise ValueError("Wrong number of integers provided for end. Expected two integers: row, column.")
@@ -53,47 +101,232 @@ def _check_args(args):
         elif any(end_coord < 0 or end_coord >= dimention_coord for end_coord, dimention_coord in zip(args.end, args.dimention)):
             raise ValueError("Value of end out of maze bounds.")
 
-    # Check of algorithm argument.
+    # Check of algorithm argument. In batch mode, each maze uses an algorithm chosen randomly among the selected ones.
     if args.algorithm is None:
-         args.algorithm = random.choice(GENERATOR_ALGORITHMS)
+         args.algorithm = list(GENERATOR_ALGORITHMS)
     else:
-        args.algorithm, = args.algorithm
+        for algorithm in args.algorithm:
+            if algorithm not in GENERATOR_ALGORITHMS:
+                raise ValueError(f"Unknown algorithm to generate maze selected. Must be one of {', '.join(GENERATOR_ALGORITHMS)}.")
+
+    if args.count is None:
+        args.algorithm = random.choice(args.algorithm)
+
+    # Check of tile size argument.
+    if args.tile_size is not None:
+        if len(args.tile_size) == 1:
+            args.tile_size = args.tile_size * len(default_dimention)
+
+        elif len(args.tile_size) != len(default_dimention):
+            raise ValueError("Wrong number of integers provided for tile size. Expected one or two integers: rows, columns.")
+
+        if any(elem < 1 for elem in args.tile_size):
+            raise ValueError("Tile size must be positive.")
+
+        if args.count is not None:
+            raise ValueError("Tiled generation is not compatible with batch generation.")
+
+    # Check of stream argument.
+    if args.stream:
+        for algorithm in ([args.algorithm] if args.count is None else args.algorithm):
+            if not get_generator_constructor(algorithm).streamable:
+                raise ValueError(f"Algorithm {algorithm} does not support streaming the maze to the output image.")
+
+        if args.tile_size is not None:
+            raise ValueError("Streaming the maze to the output image is not compatible with tiled generation.")
 
-        if args.algorithm not in GENERATOR_ALGORITHMS:
-            raise ValueError(f"Unknown algorithm to generate maze selected. Must be one of {', '.join(GENERATOR_ALGORITHMS)}.")
+    # Check of solve argument.
+    if args.solve is not None:
+        if args.solve not in SOLVER_ALGORITHMS:
+            raise ValueError(f"Unknown algorithm to solve maze selected. Must be one of {', '.join(SOLVER_ALGORITHMS)}.")
 
-    # Check of output argument.
+        if args.stream:
+            raise ValueError("Solving the maze is not compatible with streaming it to the output image.")
+
+    # Check of time budget argument.
+    if args.time_budget is not None:
+        if args.time_budget < 0:
+            raise ValueError("Time budget must not be negative.")
+
+        if args.stream or args.tile_size is not None:
+            raise ValueError("Time budget is not compatible with streaming or tiled generation.")
+
+    # Check of event log argument.
+    if args.event_log is not None:
+        if args.count is not None or args.stream:
+            raise ValueError("Logging wall changes is not compatible with batch or streamed generation.")
+
+    # Check of metrics and profile arguments.
+    if args.count is not None and (args.metrics is not None or args.profile is not None):
+        raise ValueError("Collecting metrics to a file or profiling is not compatible with batch generation.")
+
+    # Check of workers argument.
+    if args.workers is not None and args.workers < 1:
+        raise ValueError("Number of workers must be positive.")
+
+    # Check of output argument. In batch mode, it is a pattern in which {index} is replaced by the index of each maze.
+    # Solved mazes are only drawn if an output is given.
     if args.output is None:
-        args.output = f"./maze_{time_ns()}.png"
+        if args.solve is None:
+            args.output = f"./maze_{time_ns()}.png" if args.count is None else f"./maze_{time_ns()}_{{index}}.png"
 
     else:
         args.output, = args.output
 
+        if args.count is not None and '{index}' not in args.output:
+            raise ValueError("Output must contain {index} when generating multiple mazes.")
+
+        if args.solve is not None and args.output.lower().endswith('.maze'):
+            raise ValueError("Solved mazes can only be drawn as images.")
+
     return args
     
 
 
+def _save(generator, output):
+    """
+    Function saving a generated maze in the native binary format if output has a .maze extension, else as an image.
+    """
+
+    if output.lower().endswith('.maze'):
+        generator.save_map_as_maze_file(output)
+    else:
+        generator.save_map_as_img(output)
+
+
 
+def _solve(generator, algorithm, output, verbose = True):
+    """
+    Function solving a generated maze straight from its map, and drawing the solved maze if an output is given.
+    Metrics of the solver are collected along with those of the generator.
+    """
+
+    solver = get_solver_constructor(algorithm)()
+    solver.metrics = generator.metrics
+    solver.solve(generator.map, start = generator.start, end = generator.end, verbose = verbose)
 
+    if output is not None:
+        solver.save_solution_as_img(output, verbose = verbose)
 
 
 
+def _generate_one(task):
+    """
+    Function generating and saving, or solving, a single maze of a batch. Defined at module level so that it can be sent to
+    worker processes. Returns number of cells in generated maze.
+    """
+
+    algorithm, dimention, start, end, output, stream, seed, solve, time_budget = task
+
+    generator = get_generator_constructor(algorithm)(dimention, start, end, seed)
+
+    if stream:
+        generator.stream_map_as_img(output, verbose = False)
+    elif solve is not None:
+        _solve(generator.generate(verbose = False, time_budget = time_budget), solve, output, verbose = False)
+    else:
+        _save(generator.generate(verbose = False, time_budget = time_budget), output)
+
+    return dimention[0] * dimention[1]
+
+
+
+def _generate_batch(args):
+    """
+    Function generating a batch of mazes on a process pool and reporting aggregate throughput.
+    """
+
+    # All random choices are made upfront, and each maze gets its own seed, so that a batch is reproducible.
+    tasks = []
+    for index in range(args.count):
+        algorithm = random.choice(args.algorithm)
+
+        if args.max_dimention is None:
+            dimention = tuple(args.dimention)
+        else:
+            dimention = tuple(random.randint(low, high) for low, high in zip(args.dimention, args.max_dimention))
+
+        start = tuple(args.start) if args.start is not None else _random_start(dimention)
+        end   = tuple(args.end)   if args.end   is not None else _random_end(dimention, start)
+
+        output = args.output.format(index = index) if args.output is not None else None
+
+        tasks.append((algorithm, dimention, start, end, output, args.stream, random.getrandbits(64), args.solve, args.time_budget))
+
+    # Imported here as it is only needed in batch mode, and slows down startup of the script.
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = args.workers if args.workers is not None else os.cpu_count()
+
+    # Sending several tasks to a worker at once amortizes inter-process communication on small mazes.
+    chunksize = max(1, args.count // (4 * workers))
+
+    print(f'Generating {args.count} mazes with {workers} workers...')
+    start_time = time()
+
+    with ProcessPoolExecutor(max_workers = workers) as executor:
+        num_cells = sum(executor.map(_generate_one, tasks, chunksize = chunksize))
+
+    elapsed_time = time() - start_time
+    print(f'Generated {args.count} mazes ({num_cells} cells) in {elapsed_time:.5f} seconds: '
+          f'{args.count / elapsed_time:.2f} mazes/sec, {num_cells / elapsed_time:.0f} cells/sec.')
+
+
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description = 'Program generating a maze with desired dimentions, start and end. Generating algorithm can also be chosen.')
     parser.add_argument('--dimention', '-d', type = int, nargs = '+', default = None, required = False,
                         help = 'Number of rows and columns making up the maze.')
+    parser.add_argument('--max-dimention', '-D', type = int, nargs = '+', default = None, required = False,
+                        help = 'If specified, number of rows and columns of each maze are sampled uniformly between dimention and this value.')
     parser.add_argument('--start'    , '-s', type = int, nargs = '+', default = None, required = False,
                         help = 'Row and column to use as starting point of maze.')
     parser.add_argument('--end'      , '-e', type = int, nargs = '+', default = None, required = False,
                         help = 'Row and column to use as ending point of maze.')
-    parser.add_argument('--algorithm', '-a', type = str, nargs = 1  , default = None, required = False,
-                        help = 'Algorithm to use to generate the maze.')
+    parser.add_argument('--algorithm', '-a', type = str, nargs = '+', default = None, required = False,
+                        help = 'Algorithm to use to generate the maze. If several are given, one is chosen randomly for each maze.')
     parser.add_argument('--output'   , '-o', type = str, nargs = 1  , default = None, required = False,
-                        help = 'The image in which the generated maze will be drawn.')
+                        help = 'The image in which the generated maze will be drawn, or a .maze file in native binary format. With --count, a pattern containing {index}.')
+    parser.add_argument('--count'    , '-n', type = int, default = None, required = False,
+                        help = 'Number of mazes to generate in batch on a process pool. If omitted, a single maze is generated.')
+    parser.add_argument('--tile-size', '-t', type = int, nargs = '+', default = None, required = False,
+                        help = 'Rows and columns of tiles generated in parallel and stitched together. If omitted, maze is generated as a whole.')
+    parser.add_argument('--stream'   , action = 'store_true',
+                        help = 'Write the maze to the output image (.png, .ppm or .raw) row by row while generating it, using memory proportional to the number of columns only. Only supported by some algorithms.')
+    parser.add_argument('--seed'     , type = int, default = None, required = False,
+                        help = 'Seed making generation reproducible.')
+    parser.add_argument('--solve'    , type = str, default = None, required = False,
+                        help = 'Algorithm used to solve each maze right after generating it, in memory. The solved maze is then drawn to output only if one is given.')
+    parser.add_argument('--time-budget', type = float, default = None, required = False,
+                        help = 'Seconds after which random walk algorithms (aldous_broder, wilson) switch to faster algorithms to complete each maze.')
+    parser.add_argument('--event-log', type = str, default = None, required = False,
+                        help = 'File to which every change of a wall is logged during generation, which can be replayed as an animation with replay.py.')
+    parser.add_argument('--metrics'  , '-m', type = str, default = None, required = False,
+                        help = 'JSON lines file to which timings of each phase and counters are appended, besides being printed.')
+    parser.add_argument('--profile'  , type = str, default = None, required = False,
+                        help = 'File to which cProfile statistics are dumped, readable with the pstats module.')
+    parser.add_argument('--workers'  , '-w', type = int, default = None, required = False,
+                        help = 'Number of worker processes used in parallel. Defaults to number of processors.')
     
     args = parser.parse_args()
     args = _check_args(args)
 
-    get_generator_constructor(args.algorithm)(args.dimention, args.start, args.end).generate().save_map_as_img(args.output)
\ No newline at end of file
+    if args.count is not None:
+        _generate_batch(args)
+
+    else:
+        if args.tile_size is None:
+            generator = get_generator_constructor(args.algorithm)(args.dimention, args.start, args.end, args.seed)
+        else:
+            from generators.tiled import TiledGenerator
+            generator = TiledGenerator(args.dimention, args.start, args.end, args.algorithm, args.tile_size, args.workers, args.seed)
+
+        generator.metrics = MetricsCollector(None if args.metrics is None else [print_sink, JsonLinesSink(args.metrics)], args.profile)
+
+        if args.stream:
+            generator.stream_map_as_img(args.output)
+        elif args.solve is not None:
+            _solve(generator.generate(time_budget = args.time_budget, event_log = args.event_log), args.solve, args.output)
+        else:
+            _save(generator.generate(time_budget = args.time_budget, event_log = args.event_log), args.output)
\ No newline at end of file
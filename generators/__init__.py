@@ -1,22 +1,84 @@
 # -*- coding: utf-8 -*-
 
-from .random_depth_first_search import RandomDepthFirstSearch 
-from .random_kruskal import RandomKruskal
-from .random_prim import RandomPrim
-from .wilson import Wilson
-from .aldous_broder import AldousBroder
-from .recursive_division import RecursiveDivision
+"""
+Registry of maze generating algorithms. Modules implementing algorithms are only imported the first time
+their constructor or class is requested, so that importing the package stays cheap. Other packages can
+register generating algorithms through entry points of the 'mazes.generators' group, whose names are
+added to GENERATOR_ALGORITHMS and which must point to Generator classes.
+"""
 
+from importlib import import_module
 
-__generator_constructor = {'random_depth_first_search': RandomDepthFirstSearch,
-                           'random_kruskal'           : RandomKruskal,
-                           'random_prim'              : RandomPrim,
-                           'wilson'                   : Wilson,
-                           'aldous_broder'            : AldousBroder,
-                           'recursive_division'       : RecursiveDivision}
 
+# Entry point group through which other packages register generating algorithms.
+ENTRY_POINT_GROUP = 'mazes.generators'
 
-GENERATOR_ALGORITHMS = list(__generator_constructor.keys())
+# Module of each class exported by the package, imported on first access.
+__lazy_attributes = {'RandomDepthFirstSearch': '.random_depth_first_search',
+                     'RandomKruskal'         : '.random_kruskal',
+                     'RandomPrim'            : '.random_prim',
+                     'Wilson'                : '.wilson',
+                     'AldousBroder'          : '.aldous_broder',
+                     'RecursiveDivision'     : '.recursive_division',
+                     'Eller'                 : '.eller',
+                     'TiledGenerator'        : '.tiled',
+                     'EventLogReader'        : '.event_log'}
 
 
-get_generator_constructor = lambda algorithm: __generator_constructor[algorithm]
+__generator_constructor = {'random_depth_first_search': 'RandomDepthFirstSearch',
+                           'random_kruskal'           : 'RandomKruskal',
+                           'random_prim'              : 'RandomPrim',
+                           'wilson'                   : 'Wilson',
+                           'aldous_broder'            : 'AldousBroder',
+                           'recursive_division'       : 'RecursiveDivision',
+                           'eller'                    : 'Eller'}
+
+# Names exported by star imports, which load every class of the package as they are only resolved by __getattr__.
+__all__ = ['ENTRY_POINT_GROUP', 'GENERATOR_ALGORITHMS', 'get_generator_constructor', *__lazy_attributes]
+
+__entry_points = None
+
+
+def _load(attribute):
+    return getattr(import_module(__lazy_attributes[attribute], __name__), attribute)
+
+
+def _get_entry_points():
+    """Returns entry points of generating algorithms registered by other packages, discovered once."""
+
+    global __entry_points
+
+    if __entry_points is None:
+        from importlib.metadata import entry_points
+
+        # Entry points are grouped in a dictionary up to Python 3.9, and selected by group from Python 3.10.
+        all_entry_points = entry_points()
+        if hasattr(all_entry_points, 'select'):
+            group = all_entry_points.select(group = ENTRY_POINT_GROUP)
+        else:
+            group = all_entry_points.get(ENTRY_POINT_GROUP, [])
+
+        __entry_points = {entry_point.name: entry_point for entry_point in group if entry_point.name not in __generator_constructor}
+
+    return __entry_points
+
+
+def get_generator_constructor(algorithm):
+    if algorithm in __generator_constructor:
+        return _load(__generator_constructor[algorithm])
+
+    entry_points = _get_entry_points()
+    if algorithm in entry_points:
+        return entry_points[algorithm].load()
+
+    raise KeyError(algorithm)
+
+
+def __getattr__(name):
+    if name == 'GENERATOR_ALGORITHMS':
+        return list(__generator_constructor.keys()) + list(_get_entry_points().keys())
+
+    if name in __lazy_attributes:
+        return _load(name)
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -2,8 +2,9 @@
 
 import random
 
-from .maps import Map, Cell
+from .maps import Cell
 from .generator import Generator
+from .wilson import OUTSIDE, UNVISITED, IN_MAZE, DIRECTIONS, new_cell_states, grow_uniform_spanning_tree
 
 
 
@@ -12,25 +13,57 @@ class AldousBroder(Generator):
     Child Generator class implementing the Aldous-Broder Maze generation algorithm.
     This algorithm samples in an unbiased way a random maze from the uniform
     distribution over all mazes. However, on large maze sizes, the generation
-    time may be extremely long.
+    time may be extremely long. Once the cells left are estimated to need the
+    second half of the time budget of the generation, the maze is completed with
+    Wilson's algorithm, which keeps its distribution close to uniform, unless it
+    runs out of time too and the remaining cells are added with the biased
+    randomized Prim algorithm.
     """
 
     def _generate_implementation(self):
         map_rows, map_cols = self.dimention
         
-        self.map = Map(self.dimention, init_all_walls_up = True)
+        self.map = self._new_map(init_all_walls_up = True)
 
-        unvisited_cells = set(Cell(row, col) for row in range(map_rows) for col in range(map_cols))
+        # Cells are identified by their flat index in a padded grid, as in Wilson's algorithm completing the maze.
+        width = map_cols + 2
+        offsets = (-width, +width, -1, +1)
+        cell_states = new_cell_states(map_rows, map_cols)
 
-        current_cell = Cell(row = random.randrange(map_rows), col = random.randrange(map_cols))
-        unvisited_cells.remove(current_cell)
+        current_cell = (random.randrange(map_rows) + 1) * width + random.randrange(map_cols) + 1
+        cell_states[current_cell] = IN_MAZE
+        unvisited_cells = map_rows * map_cols - 1
+
+        walk_steps = 0
+        next_check = self._check_steps
 
         while unvisited_cells:
-            direction, neighbour = random.choice(self.map.get_valid_neighbours(current_cell))
-            if neighbour in unvisited_cells:
-                self.map.set_wall_of_cell(current_cell, direction, value = False)
-                unvisited_cells.remove(neighbour)
+            # Choosing directions uniformly and rejecting those leading outside of the map is equivalent
+            # to choosing uniformly among valid neighbours.
+            direction_idx = random.getrandbits(2)
+            neighbour = current_cell + offsets[direction_idx]
+
+            if cell_states[neighbour] == OUTSIDE:
+                continue
+
+            if cell_states[neighbour] == UNVISITED:
+                row, col = divmod(current_cell, width)
+                self.map.set_wall_of_cell(Cell(row - 1, col - 1), DIRECTIONS[direction_idx], value = False)
+                cell_states[neighbour] = IN_MAZE
+                unvisited_cells -= 1
             current_cell = neighbour
 
-        return self
+            # The other half of the time budget is left to Wilson's algorithm.
+            walk_steps += 1
+            if walk_steps == next_check:
+                if self._report_progress(map_rows * map_cols - unvisited_cells, walk_steps, budget_fraction = 0.5):
+                    break
+                next_check += self._check_steps
 
+        self.walk_steps = walk_steps
+
+        if unvisited_cells:
+            self.fallback = 'wilson'
+            grow_uniform_spanning_tree(self, cell_states)
+
+        return self
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+
+import random
+from collections import defaultdict
+
+import numpy as np
+
+from .generator import Generator, PixelState, COLORS_ARRAY
+from .image_writers import open_row_writer
+
+
+
+class Eller(Generator):
+    """
+    Child Generator class implementing Eller's Maze generation algorithm.
+    This algorithm builds the maze one row at a time, only keeping track of the set each cell
+    of the current row belongs to. It can therefore stream huge mazes to an image using memory
+    proportional to the number of columns only. It is biased towards horizontal corridors.
+    """
+
+    streamable = True
+
+    def _iter_rows(self):
+        """
+        Generator yielding for each row of the maze a list telling if each cell has its right wall up,
+        and a list telling if each cell has its bottom wall up.
+        """
+
+        map_rows, map_cols = self.dimention
+
+        # Label of the set each cell of current row belongs to.
+        labels = list(range(map_cols))
+        next_label = map_cols
+
+        for row in range(map_rows):
+            last_row = row == map_rows - 1
+
+            members = defaultdict(list)
+            for col, label in enumerate(labels):
+                members[label].append(col)
+
+            # Randomly join adjacent cells belonging to different sets. Last row joins all of them.
+            walls_right = [True] * map_cols
+            for col in range(map_cols - 1):
+                label, right_label = labels[col], labels[col + 1]
+
+                if label != right_label and (last_row or random.getrandbits(1)):
+                    walls_right[col] = False
+
+                    # Relabel the smaller set.
+                    if len(members[label]) < len(members[right_label]):
+                        label, right_label = right_label, label
+
+                    for member in members[right_label]:
+                        labels[member] = label
+                    members[label].extend(members.pop(right_label))
+
+            # Randomly connect cells to next row, at least one per set. Cells not connected start new sets.
+            walls_down = [True] * map_cols
+            if not last_row:
+                for cols in members.values():
+                    going_down = [col for col in cols if random.getrandbits(1)] or [random.choice(cols)]
+
+                    for col in going_down:
+                        walls_down[col] = False
+
+                for col in range(map_cols):
+                    if walls_down[col]:
+                        labels[col] = next_label
+                        next_label += 1
+
+            yield walls_right, walls_down
+
+    def _generate_implementation(self):
+
+        self.map = self._new_map(init_all_walls_up = True)
+
+        for row, (walls_right, walls_down) in enumerate(self._iter_rows()):
+            self.map.set_walls_of_row(row, walls_down, walls_right)
+
+        return self
+
+    def stream_map_as_img(self, image_path, verbose = True):
+        """
+        Generates the maze and writes it to image_path row by row without ever building the whole map.
+        Supported formats are PNG, and binary PPM for .ppm or .raw extensions.
+        """
+
+        rows, cols = self.dimention
+        image_rows, image_cols = 2*rows+1, 2*cols+1
+
+        # Rows are generated while the image is encoded, so generating them is timed as a phase nested in encoding.
+        metrics = self.metrics
+        with metrics.run('generate', f'Generated {rows}x{cols} maze with {type(self).__name__} streamed to {image_path}',
+                         verbose, algorithm = type(self).__name__, rows = rows, cols = cols):
+            if verbose:
+                print(f'Generating {rows}x{cols} maze with {type(self).__name__} streamed to {image_path}...')
+            with metrics.phase('generate'):
+                self._seed_random()
+                rows_walls = self._iter_rows()
+
+            with metrics.phase('encode'), open_row_writer(image_path, image_cols, image_rows) as writer:
+                writer.write_row(COLORS_ARRAY[np.full(image_cols, PixelState.WALL, dtype = np.uint8)].tobytes())
+
+                for row in range(rows):
+                    with metrics.phase('generate'):
+                        walls_right, walls_down = next(rows_walls)
+
+                    cells_pixels = np.full(image_cols, PixelState.WALL, dtype = np.uint8)
+                    cells_pixels[1::2] = PixelState.FREE
+                    cells_pixels[2::2][~np.array(walls_right)] = PixelState.FREE
+
+                    for cell, state in ((self.start, PixelState.START), (self.end, PixelState.END)):
+                        if cell.row == row:
+                            cells_pixels[2*cell.col+1] = state
+
+                    walls_pixels = np.full(image_cols, PixelState.WALL, dtype = np.uint8)
+                    walls_pixels[1::2][~np.array(walls_down)] = PixelState.FREE
+
+                    writer.write_row(COLORS_ARRAY[cells_pixels].tobytes())
+                    writer.write_row(COLORS_ARRAY[walls_pixels].tobytes())
+
+            metrics.update(seed = self.seed)
+
+        return self
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+
+import struct
+import sys
+from array import array
+
+import numpy as np
+
+from .maps import Cell, WallOrient
+from .generator import PixelState, COLORS_DICT, COLORS_ARRAY
+
+
+# Layout of the header of event logs: magic, format version, size in bytes of each event, rows, columns, start row and
+# column, end row and column, and whether removable walls are initially up. All integers are little endian.
+MAGIC = b'MZEV'
+VERSION = 1
+HEADER = struct.Struct('<4sHHQQQQQQ?7x')
+
+
+def _event_size(dimention):
+    """Returns the size in bytes of events of a maze, 4 unless its wall ids do not fit in 31 bits."""
+
+    rows, cols = dimention
+    num_walls = len(WallOrient) * (rows + 1) * (cols + 1)
+
+    return 4 if num_walls <= 1 << 31 else 8
+
+
+
+class EventLogWriter:
+    """
+    Class writing the changes of state of the walls of a Map to a file, as a header followed by a stream of events.
+    Each event is an integer holding the id of the changed wall (its flat index in the walls array) shifted left by
+    one, with the new value of the wall in the lowest bit. Events are buffered in an array and flushed to file in
+    chunks of chunk_size events.
+    """
+
+    chunk_size = 1 << 16
+
+    def __init__(self, path, maze_map, start, end, initial_walls_up):
+        self.num_events = 0
+
+        event_size = _event_size((maze_map.map_rows, maze_map.map_cols))
+        self._typecode = 'I' if event_size == 4 else 'Q'
+        self._buffer = array(self._typecode)
+
+        self._file = open(path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, VERSION, event_size, maze_map.map_rows, maze_map.map_cols,
+                                     start.row, start.col, end.row, end.col, initial_walls_up))
+
+    def record(self, wall_id, value):
+        """Records the change of a single wall."""
+
+        self._buffer.append(wall_id << 1 | value)
+
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+
+    def record_many(self, wall_ids, values):
+        """Records the changes of an array of walls, to values given as a boolean or an array of booleans."""
+
+        events = (np.asarray(wall_ids, dtype = np.uint64) << np.uint64(1)) | np.asarray(values, dtype = np.uint64)
+
+        self._buffer.frombytes(events.astype(self._typecode).tobytes())
+
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        # Events are stored little endian whatever the byte order of the machine.
+        if sys.byteorder == 'big':
+            self._buffer.byteswap()
+
+        self._file.write(self._buffer.tobytes())
+        self.num_events += len(self._buffer)
+        self._buffer = array(self._typecode)
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+
+
+class EventLogReader:
+    """
+    Class replaying an event log. Opening a log only parses its header and memory-maps its events, which are then
+    applied to a raster of PixelState values one frame at a time, so that replaying a whole log takes time linear
+    in its number of events, besides the time spent on each yielded frame.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            header = file.read(HEADER.size)
+
+        if len(header) != HEADER.size or header[:len(MAGIC)] != MAGIC:
+            raise ValueError(f'{path} is not an event log.')
+
+        magic, version, event_size, rows, cols, start_row, start_col, end_row, end_col, initial_walls_up = HEADER.unpack(header)
+
+        if version != VERSION:
+            raise ValueError(f'Unsupported event log version {version}.')
+
+        self.dimention = (rows, cols)
+        self.start = Cell(start_row, start_col)
+        self.end = Cell(end_row, end_col)
+        self.initial_walls_up = initial_walls_up
+
+        # A log whose writer was not closed may end with a truncated event, which is ignored.
+        dtype = np.dtype('<u4' if event_size == 4 else '<u8')
+        with open(path, 'rb') as file:
+            num_events = (file.seek(0, 2) - HEADER.size) // dtype.itemsize
+
+        if num_events > 0:
+            self.events = np.memmap(path, dtype = dtype, mode = 'r', offset = HEADER.size, shape = (num_events,))
+        else:
+            self.events = np.empty(0, dtype = dtype)
+
+    def __len__(self):
+        return len(self.events)
+
+    def _initial_pixels(self):
+        rows, cols = self.dimention
+
+        pixels = np.full((2*rows+1, 2*cols+1), PixelState.WALL, dtype = np.uint8)
+        pixels[1::2, 1::2] = PixelState.FREE
+
+        if not self.initial_walls_up:
+            pixels[2:-1:2, 1::2] = PixelState.FREE
+            pixels[1::2, 2:-1:2] = PixelState.FREE
+
+        return pixels
+
+    def iter_frames(self, events_per_frame):
+        """
+        Yields the raster of PixelState values of the maze before any event, then after every events_per_frame
+        events, and after the last event. The same array is updated in place and yielded each time.
+        """
+
+        rows, cols = self.dimention
+        walls_shape = (len(WallOrient), rows + 1, cols + 1)
+
+        pixels = self._initial_pixels()
+        for cell, state in ((self.start, PixelState.START), (self.end, PixelState.END)):
+            pixels[2*cell.row+1, 2*cell.col+1] = state
+
+        yield pixels
+
+        for first_event in range(0, len(self.events), events_per_frame):
+            events = np.asarray(self.events[first_event:first_event + events_per_frame])
+
+            # Only the last event of each wall in the frame sets its state.
+            _, last_events = np.unique((events >> 1)[::-1], return_index = True)
+            events = events[len(events) - 1 - last_events]
+
+            orients, wall_rows, wall_cols = np.unravel_index((events >> 1).astype(np.intp), walls_shape)
+            is_h = orients == WallOrient.H
+
+            # Wall H,r,c lies right above cell r,c and wall V,r,c right left of it.
+            pixel_rows = np.where(is_h, 2*wall_rows, 2*wall_rows+1)
+            pixel_cols = np.where(is_h, 2*wall_cols+1, 2*wall_cols)
+            pixels[pixel_rows, pixel_cols] = np.where(events & 1, PixelState.WALL, PixelState.FREE)
+
+            yield pixels
+
+    def save_frames(self, image_pattern, events_per_frame):
+        """Saves each frame as an image, at image_pattern where {index} is replaced by the index of the frame."""
+
+        # Pillow is only imported once frames are saved, which keeps importing generators cheap.
+        from PIL import Image
+
+        for index, pixels in enumerate(self.iter_frames(events_per_frame)):
+            Image.fromarray(COLORS_ARRAY[pixels]).save(image_pattern.format(index = index))
+
+    def save_gif(self, image_path, events_per_frame, frame_duration = 40, last_frame_duration = 2000):
+        """
+        Saves the replay as an animated GIF, showing each frame for frame_duration milliseconds and the finished
+        maze for last_frame_duration milliseconds. Each frame is encoded as soon as it is replayed, cropped to the
+        area changed since the previous frame, so that memory does not grow with the number of frames.
+        """
+
+        # Pillow is only imported once an animation is saved. Its GIF writer buffers all frames before encoding
+        # them, so frames are written one at a time with its helpers encoding the header and a single frame.
+        from PIL import Image, GifImagePlugin
+
+        # Frames are palette images indexed by PixelState, which avoids converting each frame to RGB. The palette
+        # is not optimized, so that every frame uses the global color table of the header.
+        palette = [channel for color in COLORS_DICT for channel in color]
+        num_frames = 1 + (len(self.events) + events_per_frame - 1) // events_per_frame
+
+        previous_pixels = None
+
+        with open(image_path, 'wb') as file:
+            for index, pixels in enumerate(self.iter_frames(events_per_frame)):
+                duration = last_frame_duration if index == num_frames - 1 else frame_duration
+
+                if previous_pixels is None:
+                    frame = Image.fromarray(pixels)
+                    frame.putpalette(palette)
+                    header, _ = GifImagePlugin.getheader(frame, info = {'loop': 0, 'duration': duration})
+                    file.write(b''.join(header))
+
+                    offset = (0, 0)
+                    previous_pixels = pixels.copy()
+                else:
+                    # Frames are drawn over the previous ones, so only the bounding box of changed pixels is encoded.
+                    changed = pixels != previous_pixels
+                    changed_rows = np.flatnonzero(changed.any(axis = 1))
+                    changed_cols = np.flatnonzero(changed.any(axis = 0))
+                    if len(changed_rows) == 0:
+                        changed_rows = changed_cols = np.zeros(1, dtype = np.intp)
+
+                    rows = slice(changed_rows[0], changed_rows[-1] + 1)
+                    cols = slice(changed_cols[0], changed_cols[-1] + 1)
+                    previous_pixels[rows, cols] = pixels[rows, cols]
+
+                    frame = Image.fromarray(previous_pixels[rows, cols].copy())
+                    frame.putpalette(palette)
+                    offset = (cols.start, rows.start)
+
+                file.write(b''.join(GifImagePlugin.getdata(frame, offset, duration = duration)))
+
+            # Trailer of the GIF file.
+            file.write(b';')
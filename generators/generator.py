@@ -1,42 +1,198 @@
 # -*- coding: utf-8 -*-
 
+import random
 from abc import ABC, abstractmethod
 from enum import IntEnum
-from time import time
+from time import perf_counter
 
-from PIL import Image
+import numpy as np
 
-from .maps import Cell
+from metrics import MetricsCollector
+
+from .maps import Map, Cell
+from .maze_file import save_maze_file
 
 
 # Define constants for possible cell states represented by each pixel, as well as the color in output image 
 # for each pixel type.
 PixelState = IntEnum('PixelState', ['WALL', 'FREE', 'START', 'END'], start = 0)
 COLORS_DICT = ((0, 0, 255), (0, 0, 0), (255, 0, 0), (0, 255, 0))
+COLORS_ARRAY = np.array(COLORS_DICT, dtype = np.uint8)
+
+# Seconds between two progress reports of random walks, at which time budgets are also checked. The number of walk
+# steps between two reports is adapted to the measured speed of the walk, from a small one for the first report.
+CHECK_PERIOD = 0.01
+FIRST_CHECK_STEPS = 1 << 8
+
+
+def map_to_pixel_states(maze_map, start, end):
+    """
+    Builds the whole (2*rows+1)x(2*cols+1) raster of PixelState values representing the maze
+    with bulk array operations on the walls of the map.
+    """
+
+    pixels = np.full((2*maze_map.map_rows+1, 2*maze_map.map_cols+1), PixelState.WALL, dtype = np.uint8)
+
+    # Pixels with both coordinates odd are cells, pixels right below or right of them are the walls between cells.
+    pixels[1::2, 1::2] = PixelState.FREE
+    pixels[2::2, 1::2][~maze_map.get_walls_down()] = PixelState.FREE
+    pixels[1::2, 2::2][~maze_map.get_walls_right()] = PixelState.FREE
+
+    pixels[2*start.row+1, 2*start.col+1] = PixelState.START
+    pixels[2*end.row  +1, 2*end.col  +1] = PixelState.END
+
+    return pixels
 
 
 class Generator(ABC):
     """
     Abstract class implementing a maze generating algorithm, and saving it into an output image where each
     pixel is a cell.
+    Generators which can write their maze row by row without building the whole map set streamable
+    to True and implement stream_map_as_img.
+    Generators whose run time is unbounded report their progress with _report_progress, and switch to a
+    faster algorithm, recorded in fallback as a comma separated chain of algorithms, early enough for it to
+    complete the maze within their time budget.
     """
 
-    def __init__(self, dimention, start, end):
+    streamable = False
+
+    # Estimate of the seconds taken per cell added by the algorithms random walks fall back to, updated with the
+    # cost measured on each large enough fallback.
+    fallback_seconds_per_cell = 1e-6
+
+    def __init__(self, dimention, start, end, seed = None):
         self.dimention = dimention
         self.start = Cell(*start)
         self.end = Cell(*end)
+        self.seed = seed
         self.map = None
 
-    def generate(self):
+        # Progress callback, deadline and state of the current generation.
+        self._progress = None
+        self._start_time = None
+        self._time_budget = None
+        self._last_check = None
+        self._check_steps = FIRST_CHECK_STEPS
+        self.walk_steps = 0
+        self.fallback = None
+
+        # Path of the file to which changes of walls are logged during generation, if any, and its writer, kept
+        # here so that it is closed even if the generation fails.
+        self._event_log_path = None
+        self._event_log = None
+
+        # Collector of phases timings and counters of runs, which prints them by default.
+        self.metrics = MetricsCollector()
+
+    def _seed_random(self):
+        """Seeds the random module with the seed of the generator, drawing one first if none was given."""
+
+        if self.seed is None:
+            self.seed = random.getrandbits(63)
+
+        random.seed(self.seed)
+
+    def _report_progress(self, cells_in_maze, walk_steps, budget_fraction = 1.0):
+        """
+        Calls the progress callback if any, and returns whether the fallback algorithm must start to add the cells
+        left within the given fraction of the time budget. Also sets _check_steps, the number of walk steps after
+        which to call it again so that it is called about every CHECK_PERIOD seconds.
+        """
+
+        total_cells = self.dimention[0] * self.dimention[1]
+
+        if self._progress is not None:
+            self._progress(cells_in_maze, total_cells, walk_steps)
+
+        # The number of steps at most doubles between two checks, which bounds the delay of a check after a slow down.
+        now = perf_counter()
+        last_time, last_steps = self._last_check
+        if now > last_time:
+            check_steps = int((walk_steps - last_steps) * CHECK_PERIOD / (now - last_time))
+            self._check_steps = max(1, min(check_steps, 2 * self._check_steps))
+        self._last_check = (now, walk_steps)
+
+        if self._time_budget is None:
+            return False
+
+        fallback_seconds = (total_cells - cells_in_maze) * Generator.fallback_seconds_per_cell
+        return now - self._start_time + fallback_seconds > budget_fraction * self._time_budget
+
+    def _new_map(self, init_all_walls_up = True):
+        """Creates the map of the maze, whose changes are logged to the event log of the generation if any."""
+
+        maze_map = Map(self.dimention, init_all_walls_up = init_all_walls_up)
+
+        if self._event_log_path is not None:
+            # Imported here as the event log module imports this one.
+            from .event_log import EventLogWriter
+            self._event_log = EventLogWriter(self._event_log_path, maze_map, self.start, self.end, init_all_walls_up)
+            maze_map.event_log = self._event_log
+
+        return maze_map
+
+    def generate(self, verbose = True, progress = None, time_budget = None, event_log = None):
+        """
+        Generates the maze. If given, progress is called as progress(cells_in_maze, total_cells, walk_steps)
+        periodically by random walk generators, and once generation ends. Those generators also switch to faster
+        algorithms, taking time linear in the number of cells left, as soon as these are estimated to need the rest
+        of time_budget seconds. The budget is a target rather than a limit: it is exceeded by the error of this
+        estimate, and whenever it is shorter than the linear time taken to set up and complete the maze, in which
+        case the faster algorithms start right away. If event_log is a path, every change of a wall is logged to
+        that file, which can be replayed with event_log.EventLogReader.
+        """
+
         rows, cols = self.dimention
 
-        print(f'Generating {rows}x{cols} maze with {type(self).__name__}...')
-        start_time = time()
-        self._generate_implementation()
-        print(f'Generated {rows}x{cols} maze with {type(self).__name__} in {time()-start_time:.5f} seconds.')
+        self._progress = progress
+        self._start_time = perf_counter()
+        self._time_budget = time_budget
+        self._last_check = (self._start_time, 0)
+        self._check_steps = FIRST_CHECK_STEPS
+        self.walk_steps = 0
+        self.fallback = None
+        self._event_log_path = event_log
+
+        metrics = self.metrics
+        with metrics.run('generate', f'Generated {rows}x{cols} maze with {type(self).__name__}', verbose,
+                         algorithm = type(self).__name__, rows = rows, cols = cols):
+            if verbose:
+                print(f'Generating {rows}x{cols} maze with {type(self).__name__}...')
+            try:
+                with metrics.phase('generate'):
+                    self._seed_random()
+                    self._generate_implementation()
+            finally:
+                event_log = self._close_event_log()
+
+            metrics.update(seed = self.seed)
+            if event_log is not None:
+                metrics.count('events', event_log.num_events)
+            if self.walk_steps:
+                metrics.count('walk_steps', self.walk_steps)
+            if self.fallback is not None:
+                metrics.update(fallback = self.fallback)
+                if verbose:
+                    print(f'Maze completed with {self.fallback} to fit in the time budget of {time_budget} seconds.')
+
+        if progress is not None:
+            progress(rows * cols, rows * cols, self.walk_steps)
 
         return self
 
+    def _close_event_log(self):
+        """Closes the event log of the generation if any, and detaches it from the map. Returns the closed writer."""
+
+        event_log, self._event_log = self._event_log, None
+
+        if event_log is not None:
+            if self.map is not None and self.map.event_log is event_log:
+                self.map.event_log = None
+            event_log.close()
+
+        return event_log
+
     @abstractmethod
     def _generate_implementation(self):
         raise NotImplementedError
@@ -46,23 +202,18 @@ class Generator(ABC):
         if self.map is None:
             raise RuntimeError("save_map_as_img method called before generate method.")
 
-        image_rows, image_cols = tuple(2*coord+1 for coord in self.dimention)
+        # Pillow is only imported once an image is saved, which keeps importing generators cheap.
+        from PIL import Image
 
-        image = Image.new(mode = 'RGB', size = (image_cols, image_rows), color = COLORS_DICT[ PixelState.WALL ])
+        pixels = map_to_pixel_states(self.map, self.start, self.end)
 
-        for cell, wall_down, wall_right in self.map.iter_cells():
-            top_left_px_row = 2 * cell.row + 1
-            top_left_px_col = 2 * cell.col + 1
+        image = Image.fromarray(COLORS_ARRAY[pixels])
 
-            image.putpixel( (top_left_px_col, top_left_px_row), COLORS_DICT[ PixelState.FREE ] )
+        image.save(image_path)
 
-            if not wall_down:
-                image.putpixel( (top_left_px_col, top_left_px_row + 1), COLORS_DICT[ PixelState.FREE ] )
+    def save_map_as_maze_file(self, file_path):
 
-            if not wall_right:
-                image.putpixel( (top_left_px_col + 1, top_left_px_row), COLORS_DICT[ PixelState.FREE ] )
-
-        image.putpixel((2*self.start.col+1, 2*self.start.row+1), COLORS_DICT[ PixelState.START ] )
-        image.putpixel((2*self.end.col  +1, 2*self.end.row  +1), COLORS_DICT[ PixelState.END   ] )
+        if self.map is None:
+            raise RuntimeError("save_map_as_maze_file method called before generate method.")
 
-        image.save(image_path)
\ No newline at end of file
+        save_maze_file(file_path, self.map, self.start, self.end, type(self).__name__, self.seed)
\ No newline at end of file
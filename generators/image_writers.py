@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+import struct
+import zlib
+from os import path
+
+
+class PNGRowWriter:
+    """
+    Class writing an RGB PNG image incrementally, one row of pixels at a time, so that images larger
+    than the available memory can be produced. Compressed data is flushed to file in IDAT chunks.
+    """
+
+    signature = b'\x89PNG\r\n\x1a\n'
+    chunk_size = 1 << 20
+
+    def __init__(self, image_path, width, height, compression_level = 6):
+        self.width = width
+        self.height = height
+        self.rows_written = 0
+
+        self._file = open(image_path, 'wb')
+        self._compressor = zlib.compressobj(compression_level)
+        self._buffer = bytearray()
+
+        self._file.write(self.signature)
+        # Bit depth 8, color type 2 (RGB), default compression, filter and interlace methods.
+        self._write_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+
+    def _write_chunk(self, chunk_type, data):
+        self._file.write(struct.pack('>I', len(data)))
+        self._file.write(chunk_type)
+        self._file.write(data)
+        self._file.write(struct.pack('>I', zlib.crc32(data, zlib.crc32(chunk_type))))
+
+    def write_row(self, row):
+        """Writes a row given as bytes of width RGB triplets."""
+
+        # Each row is prefixed with filter type 0 (no filtering).
+        self._buffer += self._compressor.compress(b'\x00')
+        self._buffer += self._compressor.compress(row)
+        self.rows_written += 1
+
+        if len(self._buffer) >= self.chunk_size:
+            self._write_chunk(b'IDAT', bytes(self._buffer))
+            self._buffer.clear()
+
+    def close(self):
+        if self.rows_written != self.height:
+            raise RuntimeError(f'Image closed after writing {self.rows_written} rows out of {self.height}.')
+
+        self._buffer += self._compressor.flush()
+        self._write_chunk(b'IDAT', bytes(self._buffer))
+        self._write_chunk(b'IEND', b'')
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.close()
+
+
+
+class PPMRowWriter:
+    """
+    Class writing an uncompressed binary PPM image (raw RGB bytes following a short text header)
+    incrementally, one row of pixels at a time.
+    """
+
+    def __init__(self, image_path, width, height):
+        self.width = width
+        self.height = height
+        self.rows_written = 0
+
+        self._file = open(image_path, 'wb')
+        self._file.write(f'P6\n{width} {height}\n255\n'.encode('ascii'))
+
+    def write_row(self, row):
+        """Writes a row given as bytes of width RGB triplets."""
+        self._file.write(row)
+        self.rows_written += 1
+
+    def close(self):
+        if self.rows_written != self.height:
+            raise RuntimeError(f'Image closed after writing {self.rows_written} rows out of {self.height}.')
+
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.close()
+
+
+
+def open_row_writer(image_path, width, height):
+    """Returns a row writer suitable for the extension of image_path (PNG, or PPM for .ppm and .raw)."""
+
+    extension = path.splitext(image_path)[1].lower()
+
+    if extension == '.png':
+        return PNGRowWriter(image_path, width, height)
+    elif extension in ('.ppm', '.raw'):
+        return PPMRowWriter(image_path, width, height)
+
+    raise ValueError(f'Unsupported extension for streamed image: {extension}. Must be one of .png, .ppm, .raw.')
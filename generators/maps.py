@@ -3,6 +3,8 @@
 from collections import namedtuple
 from enum import IntEnum
 
+import numpy as np
+
 
 # Define namedtuple used to identify cell and access its attributes without indexing.
 Cell = namedtuple('Cell', ['row', 'col'])
@@ -37,16 +39,56 @@ class Map:
         #            ------------------
         #               wall H,r+1,c
         #
-        self._walls = [[[init_all_walls_up if self.wall_is_removable(orient, row, col) else True for col in range(self.num_v_walls)] for row in range(self.num_h_walls)] for orient in WallOrient]
+        # Walls are stored in a single contiguous boolean array of shape (2, rows+1, cols+1), which takes
+        # 2*(rows+1)*(cols+1) bytes, i.e. about 2 bytes per cell (a 5000x5000 maze needs ~50 MB).
+        # Slots which do not correspond to a removable wall (border walls and the padding H,r,cols and
+        # V,rows,c) are set once here with slicing and always stay up.
+        self._walls = np.full((len(WallOrient), self.num_h_walls, self.num_v_walls), init_all_walls_up, dtype = bool)
+
+        self._walls[WallOrient.H, [0, self.map_rows], :] = True
+        self._walls[WallOrient.H, :, self.map_cols] = True
+        self._walls[WallOrient.V, :, [0, self.map_cols]] = True
+        self._walls[WallOrient.V, self.map_rows, :] = True
+
+        # Writer to which changes of removable walls are recorded, if any (see event_log.py).
+        self.event_log = None
+
+    @classmethod
+    def from_walls(cls, walls):
+        """
+        Builds a map around an existing walls array of shape (2, rows+1, cols+1), as returned by get_walls_array.
+        The array is used as is, without copy.
+        """
+
+        maze_map = cls.__new__(cls)
+        maze_map.map_rows = walls.shape[1] - 1
+        maze_map.map_cols = walls.shape[2] - 1
+        maze_map.num_h_walls = maze_map.map_rows + 1
+        maze_map.num_v_walls = maze_map.map_cols + 1
+        maze_map._walls = walls
+        maze_map.event_log = None
+
+        return maze_map
+
+    def get_walls_array(self):
+        """Returns the (2, rows+1, cols+1) boolean array holding the state of all walls."""
+        return self._walls
 
     def iter_cells(self):
+        walls_down  = self.get_walls_down()
+        walls_right = self.get_walls_right()
+
         for row in range(self.map_rows):
-            for col in range(self.map_cols):
-                cell = Cell(row, col)
-                wall_down  = self._walls[WallOrient.H][row+1][col]
-                wall_right = self._walls[WallOrient.V][row][col+1]
+            for col, (wall_down, wall_right) in enumerate(zip(walls_down[row].tolist(), walls_right[row].tolist())):
+                yield Cell(row, col), wall_down, wall_right
 
-                yield cell, wall_down, wall_right
+    def get_walls_down(self):
+        """Returns a (rows, cols) boolean view telling for each cell if its bottom wall is up."""
+        return self._walls[WallOrient.H, 1:, :self.map_cols]
+
+    def get_walls_right(self):
+        """Returns a (rows, cols) boolean view telling for each cell if its right wall is up."""
+        return self._walls[WallOrient.V, :self.map_rows, 1:]
 
     # Utilitary methods used by different generation algorithms.
     def set_wall_of_cell(self, cell, direction, value):
@@ -61,23 +103,105 @@ class Map:
 
         self.set_wall_idx(*idx, value)
 
+    def set_walls_of_row(self, row, walls_down, walls_right):
+        """Sets bottom and right walls of all cells in a row at once. Border walls must be left up."""
+
+        walls_down  = np.asarray(walls_down, dtype = bool)
+        walls_right = np.asarray(walls_right, dtype = bool)
+
+        if (row == self.map_rows - 1 and not walls_down.all()) or not walls_right[-1]:
+            raise IndexError(f'Border walls of row {row} are not removable')
+
+        if self.event_log is not None:
+            cols = np.arange(self.map_cols)
+            self._record_changes(self.get_wall_ids(WallOrient.H, row + 1, cols), walls_down)
+            self._record_changes(self.get_wall_ids(WallOrient.V, row, cols + 1), walls_right)
+
+        self.get_walls_down()[row]  = walls_down
+        self.get_walls_right()[row] = walls_right
+
     def wall_is_removable(self, orient, row, col):
-        return not ((orient == WallOrient.H and (row == 0 or row == self.map_rows)) or \
-                    (orient == WallOrient.V and (col == 0 or col == self.map_cols)) or \
-                    (orient == WallOrient.H and col == self.map_cols) or \
-                    (orient == WallOrient.V and row == self.map_rows))
+        if orient == WallOrient.H:
+            return 0 < row < self.map_rows and 0 <= col < self.map_cols
+
+        return 0 <= row < self.map_rows and 0 < col < self.map_cols
 
     def set_wall_idx(self, orient, row, col, value):
         if not self.wall_is_removable(orient, row, col):
-            raise IndexError(f'Wall {(orient.name, row, col)} is not removable')
+            raise IndexError(f'Wall {(WallOrient(orient).name, row, col)} is not removable')
+
+        if self.event_log is not None and self._walls[orient, row, col] != value:
+            self.event_log.record((orient * self.num_h_walls + row) * self.num_v_walls + col, value)
 
-        self._walls[orient][row][col] = value
+        self._walls[orient, row, col] = value
 
     def is_cell_in_map(self, cell):
         return cell.row >= 0 and cell.row < self.map_rows and cell.col >= 0 and cell.col < self.map_cols
         
     def get_list_of_removable_walls(self):
-        return [(orient, row, col) for orient in WallOrient for row in range(self.num_h_walls) for col in range(self.num_v_walls) if self.wall_is_removable(orient, row, col)]
+        return [(WallOrient.H, row, col) for row in range(1, self.map_rows) for col in range(self.map_cols)] + \
+               [(WallOrient.V, row, col) for row in range(self.map_rows) for col in range(1, self.map_cols)]
+
+    # Utilitary methods working on flat integer ids, used by generation algorithms operating on whole arrays.
+    # A wall id is the flat index of the wall in the walls array, a cell id is row * cols + col.
+    def get_wall_ids(self, orient, rows, cols):
+        """Returns ids of walls with given orientation, rows and columns (broadcasted against each other)."""
+        return np.ravel_multi_index((orient, rows, cols), self._walls.shape)
+
+    def get_removable_wall_ids(self):
+        h_rows, h_cols = np.ogrid[1:self.map_rows, 0:self.map_cols]
+        v_rows, v_cols = np.ogrid[0:self.map_rows, 1:self.map_cols]
+
+        return np.concatenate((self.get_wall_ids(WallOrient.H, h_rows, h_cols).ravel(),
+                               self.get_wall_ids(WallOrient.V, v_rows, v_cols).ravel()))
+
+    def get_cells_around_wall_ids(self, wall_ids):
+        orients, rows, cols = np.unravel_index(wall_ids, self._walls.shape)
+        cell_ids = rows * self.map_cols + cols
+
+        # Cell above an horizontal wall or left of a vertical wall.
+        other_cell_ids = np.where(orients == WallOrient.H, cell_ids - self.map_cols, cell_ids - 1)
+
+        return other_cell_ids, cell_ids
+
+    def set_walls_by_id(self, wall_ids, value):
+        wall_ids = np.asarray(wall_ids, dtype = np.intp)
+        orients, rows, cols = np.unravel_index(wall_ids, self._walls.shape)
+
+        is_h = orients == WallOrient.H
+        removable = np.where(is_h, (rows > 0) & (rows < self.map_rows) & (cols < self.map_cols), 
+                                   (cols > 0) & (cols < self.map_cols) & (rows < self.map_rows))
+        if not np.all(removable):
+            raise IndexError('Some walls are not removable')
+
+        if self.event_log is not None:
+            self._record_changes(wall_ids, value)
+
+        self._walls.reshape(-1)[wall_ids] = value
+
+    def paste_map(self, other, row, col):
+        """
+        Copies walls of all cells of another map into this map, with top-left cell of other map
+        placed at (row, col). Walls on the border of the pasted area are copied too.
+        """
+
+        if self.event_log is not None:
+            h_rows, h_cols = np.ogrid[row:row + other.num_h_walls, col:col + other.map_cols]
+            v_rows, v_cols = np.ogrid[row:row + other.map_rows, col:col + other.num_v_walls]
+            self._record_changes(self.get_wall_ids(WallOrient.H, h_rows, h_cols), other._walls[WallOrient.H, :, :other.map_cols])
+            self._record_changes(self.get_wall_ids(WallOrient.V, v_rows, v_cols), other._walls[WallOrient.V, :other.map_rows, :])
+
+        self._walls[WallOrient.H, row:row + other.num_h_walls, col:col + other.map_cols] = other._walls[WallOrient.H, :, :other.map_cols]
+        self._walls[WallOrient.V, row:row + other.map_rows, col:col + other.num_v_walls] = other._walls[WallOrient.V, :other.map_rows, :]
+
+    def _record_changes(self, wall_ids, values):
+        """Records in the event log the walls whose state differs from the values (broadcasted) about to be set."""
+
+        wall_ids, values = np.broadcast_arrays(np.asarray(wall_ids, dtype = np.intp), np.asarray(values, dtype = bool))
+        wall_ids, values = wall_ids.ravel(), values.ravel()
+        changed = self._walls.reshape(-1)[wall_ids] != values
+
+        self.event_log.record_many(wall_ids[changed], values[changed])
 
     def get_cells_around_wall(self, orient, row, col):
         if orient == WallOrient.H:
@@ -86,12 +210,18 @@ class Map:
         return Cell(row, col-1), Cell(row, col)
 
     def get_walls_around_cell(self, cell):
-        walls = [(WallOrient.H, cell.row, cell.col),
-                 (WallOrient.H, cell.row + 1, cell.col), 
-                 (WallOrient.V, cell.row, cell.col), 
-                 (WallOrient.V, cell.row, cell.col + 1)]
-
-        return [wall for wall in walls if self.wall_is_removable(*wall)]
+        walls = []
+
+        if cell.row > 0:
+            walls.append((WallOrient.H, cell.row, cell.col))
+        if cell.row < self.map_rows - 1:
+            walls.append((WallOrient.H, cell.row + 1, cell.col))
+        if cell.col > 0:
+            walls.append((WallOrient.V, cell.row, cell.col))
+        if cell.col < self.map_cols - 1:
+            walls.append((WallOrient.V, cell.row, cell.col + 1))
+
+        return walls
 
     def get_valid_neighbours(self, cell, prev_direction = None):
         valid_neighbours = []
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+import struct
+
+import numpy as np
+
+from .maps import Map, Cell, WallOrient
+
+
+# Layout of the header of maze files: magic, format version, rows, columns, start row and column, end row and column,
+# seed used to generate the maze and name of the generating algorithm (utf-8, null padded). All integers are little endian.
+MAGIC = b'MAZE'
+VERSION = 1
+HEADER = struct.Struct('<4sHxxQQQQQQQ32s')
+
+
+class MazeFile:
+    """
+    Class representing a maze stored in the native binary format: a fixed size header followed by the walls array of
+    a Map packed with one bit per wall (about 2 bits per cell). Opening a file only parses its header and memory-maps
+    the packed walls, which are unpacked into a Map on demand.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            header = file.read(HEADER.size)
+
+        if len(header) != HEADER.size or header[:len(MAGIC)] != MAGIC:
+            raise ValueError(f'{path} is not a maze file.')
+
+        magic, version, rows, cols, start_row, start_col, end_row, end_col, seed, algorithm = HEADER.unpack(header)
+
+        if version != VERSION:
+            raise ValueError(f'Unsupported maze file version {version}.')
+
+        self.dimention = (rows, cols)
+        self.start = Cell(start_row, start_col)
+        self.end = Cell(end_row, end_col)
+        self.seed = seed
+        self.algorithm = algorithm.rstrip(b'\0').decode('utf-8')
+
+        self._walls_shape = (len(WallOrient), rows + 1, cols + 1)
+        self.packed_walls = np.memmap(path, dtype = np.uint8, mode = 'r', offset = HEADER.size,
+                                      shape = (_num_packed_bytes(self._walls_shape),))
+
+    def load_map(self):
+        """Unpacks the walls into a new Map."""
+
+        num_walls = int(np.prod(self._walls_shape))
+        walls = np.unpackbits(self.packed_walls, count = num_walls, bitorder = 'little').view(bool)
+
+        return Map.from_walls(walls.reshape(self._walls_shape))
+
+
+
+def _num_packed_bytes(walls_shape):
+    return -(-int(np.prod(walls_shape)) // 8)
+
+
+
+def save_maze_file(path, maze_map, start, end, algorithm = '', seed = 0):
+    """Saves a Map along with start, end and generation information in the native binary format."""
+
+    header = HEADER.pack(MAGIC, VERSION, maze_map.map_rows, maze_map.map_cols, start.row, start.col, end.row, end.col,
+                         seed, algorithm.encode('utf-8')[:32])
+
+    with open(path, 'wb') as file:
+        file.write(header)
+        file.write(np.packbits(maze_map.get_walls_array(), axis = None, bitorder = 'little').tobytes())
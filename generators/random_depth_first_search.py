@@ -2,7 +2,7 @@
 
 import random
 
-from .maps import Map, Cell, Direction
+from .maps import Cell, Direction
 from .generator import Generator
 
 
@@ -20,12 +20,13 @@ class RandomDepthFirstSearch(Generator):
                              Direction.LEFT : (0, -1),
                              Direction.RIGHT: (0, +1)}
 
-        self.map = Map(self.dimention, init_all_walls_up = True)
+        self.map = self._new_map(init_all_walls_up = True)
 
         stack = [Cell(row = random.randrange(map_rows), col = random.randrange(map_cols))]
 
         # Initialize array of booleans to determine if each cell was already visited. 
         visited = [[False for _ in range(map_cols)] for _ in range(map_rows)]
+        visited[stack[0].row][stack[0].col] = True
 
         while stack:
             current_cell = stack.pop()
@@ -1,40 +1,35 @@
 # -*- coding: utf-8 -*-
 
 import random
+from array import array
+
+import numpy as np
 
-from .maps import Map, Cell
 from .generator import Generator
 
 
 
 class DisjointSet:
     """
-    Utilitary class implementing the Disjoint Set data structure.
+    Utilitary class implementing the Disjoint Set data structure over nodes identified
+    by integers in range(num_nodes). Parents and ranks are stored in flat arrays.
     """
 
-    def __init__(self, nodes = [], parents = None):
-        self.nodes = nodes
-        self.parents = parents if parents is not None else {elem: elem for elem in self.nodes}
-
-    def add_node(self, node, parent = None):
-        """
-        Adds a new node to the disjoint set, putting it into a set of its own.
-        If node already exists in the disjoint set, no operation is performed.
-        """
-        if node not in self.nodes:
-            self.nodes.append(node)
-            self.parents[node] = parent if parent is None else node
+    def __init__(self, num_nodes):
+        self.parents = array('q', range(num_nodes))
+        self.ranks = bytearray(num_nodes)
 
     def find(self, item):
         """
         Implementation of find algorithm for disjoint sets with no recursion and using path halving.
         """
 
-        parent = self.parents[item]
+        parents = self.parents
+        parent = parents[item]
 
         while parent != item:
-            grandparent = self.parents[parent]
-            self.parents[item] = grandparent
+            grandparent = parents[parent]
+            parents[item] = grandparent
             item = parent
             parent = grandparent
             
@@ -42,16 +37,30 @@ class DisjointSet:
 
     def union(self, node1, node2):
         """
-        Merges the two sets contained the nodes passed as parameter into a single set.
+        Merges the two sets contained the nodes passed as parameter into a single set, linking
+        the root of lower rank under the root of higher rank.
         Returns true if the two nodes were already in the same set, else False.
         """
 
         root1 = self.find(node1)
         root2 = self.find(node2)
-        self.parents[root1] = root2
 
         # Return true if node1 and node2 belonged to the same set already. 
-        return root1 == root2
+        if root1 == root2:
+            return True
+
+        rank1 = self.ranks[root1]
+        rank2 = self.ranks[root2]
+
+        if rank1 < rank2:
+            self.parents[root1] = root2
+        elif rank1 > rank2:
+            self.parents[root2] = root1
+        else:
+            self.parents[root2] = root1
+            self.ranks[root1] = rank1 + 1
+
+        return False
 
 
 
@@ -62,21 +71,37 @@ class RandomKruskal(Generator):
     This algorithm is biased towards generating mazes with many short dead ends.
     """
 
+    # Number of walls whose surrounding cells are computed at once, bounding memory on huge mazes.
+    chunk_size = 1 << 20
+
     def _generate_implementation(self):
         
         map_rows, map_cols = self.dimention
         
-        self.map = Map(self.dimention, init_all_walls_up = True)
+        self.map = self._new_map(init_all_walls_up = True)
+
+        # Shuffle integer wall ids with a NumPy generator seeded from the random module, so that
+        # seeding the random module still makes generation reproducible.
+        rng = np.random.default_rng(random.getrandbits(64))
+        walls = rng.permutation(self.map.get_removable_wall_ids())
+
+        cells_sets = DisjointSet(map_rows * map_cols)
+
+        # A spanning tree over all cells is complete once num_cells - 1 walls have been removed.
+        removed_walls = []
+        num_walls_to_remove = map_rows * map_cols - 1
+
+        for chunk_start in range(0, len(walls), self.chunk_size):
+            walls_chunk = walls[chunk_start:chunk_start + self.chunk_size]
+            cells1, cells2 = self.map.get_cells_around_wall_ids(walls_chunk)
 
-        walls = self.map.get_list_of_removable_walls()
-        random.shuffle(walls)
-                
-        cells_sets = DisjointSet([Cell(row, col) for row in range(map_rows) for col in range(map_cols)])
+            for wall, cell1, cell2 in zip(walls_chunk.tolist(), cells1.tolist(), cells2.tolist()):
+                if not cells_sets.union(cell1, cell2):
+                    removed_walls.append(wall)
 
-        for wall in walls:
-            cells = self.map.get_cells_around_wall(*wall) 
+            if len(removed_walls) == num_walls_to_remove:
+                break
 
-            if not cells_sets.union(*cells):
-                self.map.set_wall_idx(*wall, value = False)
+        self.map.set_walls_by_id(removed_walls, value = False)
         
         return self
\ No newline at end of file
@@ -2,7 +2,7 @@
 
 import random
 
-from .maps import Map, Cell
+from .maps import Cell
 from .generator import Generator
 
 
@@ -16,7 +16,7 @@ class RandomPrim(Generator):
     def _generate_implementation(self):
         map_rows, map_cols = self.dimention
         
-        self.map = Map(self.dimention, init_all_walls_up = True)
+        self.map = self._new_map(init_all_walls_up = True)
 
         # Initialize array of booleans to determine if each cell was already visited. 
         visited = [[False for _ in range(map_cols)] for _ in range(map_rows)]
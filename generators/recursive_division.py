@@ -3,7 +3,7 @@
 import random
 from collections import namedtuple
 
-from .maps import Map, WallOrient
+from .maps import WallOrient
 from .generator import Generator
 
 
@@ -22,7 +22,7 @@ class RecursiveDivision(Generator):
     def _generate_implementation(self):
         map_rows, map_cols = self.dimention
         
-        self.map = Map(self.dimention, init_all_walls_up = False)
+        self.map = self._new_map(init_all_walls_up = False)
 
         chambers_to_divide = [Chamber(row = 0, col = 0, width = map_cols, height = map_rows)]
 
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from .maps import WallOrient
+from .generator import Generator
+from .random_kruskal import DisjointSet
+
+
+
+def _generate_tile(algorithm, dimention, seed):
+    """
+    Generates the map of a single tile. Defined at module level so that it can be sent to worker processes.
+    """
+
+    # Imported here as the package imports this module.
+    from . import get_generator_constructor
+
+    # Start and end are irrelevant for a tile, as only its walls are kept.
+    generator = get_generator_constructor(algorithm)(dimention, (0, 0), (0, 0), seed)
+
+    return generator.generate(verbose = False).map
+
+
+
+class TiledGenerator(Generator):
+    """
+    Child Generator class splitting the maze into tiles which are generated in parallel on a process pool
+    using any registered generating algorithm. As each tile is a perfect maze, tiles are then stitched into a
+    single perfect maze by a randomized Kruskal pass over the walls on tile borders, removing one wall between
+    each pair of tiles joined by the spanning tree over tiles. Inside each tile, the maze keeps the biases of
+    the chosen algorithm, but the maze as a whole is not sampled uniformly even when using an unbiased algorithm.
+    """
+
+    def __init__(self, dimention, start, end, algorithm, tile_size = (1000, 1000), workers = None, seed = None):
+        super().__init__(dimention, start, end, seed)
+        self.algorithm = algorithm
+        self.tile_size = tile_size
+        self.workers = workers
+
+    def _generate_implementation(self):
+        map_rows, map_cols = self.dimention
+        tile_rows, tile_cols = self.tile_size
+
+        self.map = self._new_map(init_all_walls_up = True)
+
+        tiles_origins = [(row, col) for row in range(0, map_rows, tile_rows) for col in range(0, map_cols, tile_cols)]
+
+        with ProcessPoolExecutor(max_workers = self.workers) as executor:
+            futures = {}
+            for row, col in tiles_origins:
+                tile_dimention = (min(tile_rows, map_rows - row), min(tile_cols, map_cols - col))
+                future = executor.submit(_generate_tile, self.algorithm, tile_dimention, random.getrandbits(64))
+                futures[future] = (row, col)
+
+            for future in as_completed(futures):
+                self.map.paste_map(future.result(), *futures[future])
+
+        self._stitch_tiles()
+
+        return self
+
+    def _stitch_tiles(self):
+        map_rows, map_cols = self.dimention
+        tile_rows, tile_cols = self.tile_size
+        num_tiles_cols = -(-map_cols // tile_cols)
+        num_tiles = -(-map_rows // tile_rows) * num_tiles_cols
+
+        # Only walls on the borders between tiles are considered.
+        h_rows, h_cols = np.ogrid[tile_rows:map_rows:tile_rows, 0:map_cols]
+        v_rows, v_cols = np.ogrid[0:map_rows, tile_cols:map_cols:tile_cols]
+
+        walls = np.concatenate((self.map.get_wall_ids(WallOrient.H, h_rows, h_cols).ravel(),
+                                self.map.get_wall_ids(WallOrient.V, v_rows, v_cols).ravel()))
+        cells1, cells2 = self.map.get_cells_around_wall_ids(walls)
+
+        rows1, cols1 = np.divmod(cells1, map_cols)
+        rows2, cols2 = np.divmod(cells2, map_cols)
+        tiles1 = (rows1 // tile_rows) * num_tiles_cols + cols1 // tile_cols
+        tiles2 = (rows2 // tile_rows) * num_tiles_cols + cols2 // tile_cols
+
+        permutation = np.random.default_rng(random.getrandbits(64)).permutation(len(walls))
+
+        tiles_sets = DisjointSet(num_tiles)
+        removed_walls = []
+        for wall, tile1, tile2 in zip(walls[permutation].tolist(), tiles1[permutation].tolist(), tiles2[permutation].tolist()):
+            if not tiles_sets.union(tile1, tile2):
+                removed_walls.append(wall)
+
+        self.map.set_walls_by_id(removed_walls, value = False)
@@ -1,40 +1,203 @@
 # -*- coding: utf-8 -*-
 
 import random
+from array import array
+from time import perf_counter
 
-from .maps import Map, Cell, Direction
+import numpy as np
+
+from .maps import Cell, Direction, WallOrient
 from .generator import Generator
 
 
+# States of the cells of the padded grid, and direction corresponding to each offset between cells.
+OUTSIDE, UNVISITED, IN_MAZE = range(3)
+DIRECTIONS = (Direction.UP, Direction.DOWN, Direction.LEFT, Direction.RIGHT)
+
+# Orientation of the wall of a cell in each direction, and offsets from the cell to the indices of that wall.
+WALL_ORIENTS = np.array([WallOrient.H, WallOrient.H, WallOrient.V, WallOrient.V], dtype = np.intp)
+WALL_ROW_OFFSETS = np.array([0, 1, 0, 0], dtype = np.intp)
+WALL_COL_OFFSETS = np.array([0, 0, 0, 1], dtype = np.intp)
+
+# Minimal number of cells added by a fallback for its cost per cell to be measured reliably.
+MIN_MEASURED_FALLBACK_CELLS = 1 << 12
+
 
-class ListSetHybrid:
+class IndexedSet:
     """
-    Utilitary class implementing a data structure containing reference to its elements
-    both inside a list and a set. This allow for list-like ordered storage of elements
-    and O(1) check of elements inside list. 
+    Utilitary class implementing a set of integers in range(max_elem) backed by a list, with
+    an array keeping track of the position of each element in the list. This allows for O(1)
+    removal of elements and O(1) uniform sampling of a random element.
     """
 
-    def __init__(self, elements = []):
+    def __init__(self, elements, max_elem):
         self._list = list(elements)
-        self._set  = set(self._list)
 
-    def __contains__(self, elem):
-        return elem in self._set
+        positions = np.zeros(max_elem, dtype = np.int64)
+        positions[self._list] = np.arange(len(self._list))
+        self._positions = array('q', positions.tobytes())
 
-    def __getitem__(self, idx):
-        return self._list[idx]
+    def __len__(self):
+        return len(self._list)
 
-    def append(self, elem):
-        self._list.append(elem)
-        self._set.add(elem)
-
-    def pop(self):
+    def remove(self, elem):
+        # Move last element in place of the removed one.
+        position = self._positions[elem]
         last_elem = self._list.pop()
-        self._set.remove(last_elem)
-        return last_elem
 
-    def get_set(self):
-        return self._set
+        if last_elem != elem:
+            self._list[position] = last_elem
+            self._positions[last_elem] = position
+
+    def choice(self):
+        return self._list[random.randrange(len(self._list))]
+
+
+
+def new_cell_states(map_rows, map_cols):
+    """
+    Function returning the states of the cells of a map, all unvisited. Cells are identified by their flat index in
+    a grid padded by one cell on each side, of width map_cols + 2. Walking into the padding can then be detected with
+    a lookup instead of bound checks.
+    """
+
+    cell_states = np.full((map_rows + 2, map_cols + 2), OUTSIDE, dtype = np.uint8)
+    cell_states[1:-1, 1:-1] = UNVISITED
+
+    return bytearray(cell_states.tobytes())
+
+
+def grow_uniform_spanning_tree(generator, cell_states = None):
+    """
+    Function growing the maze of the map of a generator, made of the cells in maze in the given states (see
+    new_cell_states) whose walls were already removed, with Wilson's algorithm until it spans the whole map. Every
+    completion of the partial maze is equally likely, which keeps a maze partially sampled by Aldous-Broder's
+    algorithm close to, though not exactly, uniform. If no states are given, the maze is initialized with one random
+    cell. Once the cells left are estimated to need the rest of the time budget of the generator, they are added with
+    a randomized Prim algorithm instead, which is fast but biased.
+    """
+
+    map_rows, map_cols = generator.dimention
+    width = map_cols + 2
+
+    if cell_states is None:
+        cell_states = new_cell_states(map_rows, map_cols)
+
+    offsets = (-width, +width, -1, +1)
+
+    # Direction in which the walk last exited each cell.
+    exits = bytearray(len(cell_states))
+
+    unvisited_ids = np.flatnonzero(np.frombuffer(cell_states, dtype = np.uint8) == UNVISITED)
+    unvisited_cells = IndexedSet(unvisited_ids.tolist(), len(cell_states))
+
+    # Initialize maze with one cell chosen randomly.
+    if len(unvisited_cells) == map_rows * map_cols:
+        first_cell = unvisited_cells.choice()
+        cell_states[first_cell] = IN_MAZE
+        unvisited_cells.remove(first_cell)
+
+    walk_steps = 0
+    next_check = generator._check_steps
+    time_is_up = False
+
+    while unvisited_cells:
+        start_cell = unvisited_cells.choice()
+
+        # Random walk until maze is reached. Choosing directions uniformly and rejecting those leading
+        # outside of the map is equivalent to choosing uniformly among valid neighbours.
+        current_cell = start_cell
+        while cell_states[current_cell] != IN_MAZE:
+            direction_idx = random.getrandbits(2)
+            next_cell = current_cell + offsets[direction_idx]
+
+            if cell_states[next_cell] != OUTSIDE:
+                exits[current_cell] = direction_idx
+                current_cell = next_cell
+
+                walk_steps += 1
+                if walk_steps == next_check:
+                    cells_in_maze = map_rows * map_cols - len(unvisited_cells)
+                    if generator._report_progress(cells_in_maze, generator.walk_steps + walk_steps):
+                        time_is_up = True
+                        break
+                    next_check += generator._check_steps
+
+        if time_is_up:
+            break
+
+        # Follow last exits from start, which retraces the loop-erased walk, and add it to maze.
+        current_cell = start_cell
+        while cell_states[current_cell] != IN_MAZE:
+            cell_states[current_cell] = IN_MAZE
+            unvisited_cells.remove(current_cell)
+
+            direction_idx = exits[current_cell]
+            row, col = divmod(current_cell, width)
+            generator.map.set_wall_of_cell(Cell(row - 1, col - 1), DIRECTIONS[direction_idx], value = False)
+
+            current_cell += offsets[direction_idx]
+
+    generator.walk_steps += walk_steps
+
+    if time_is_up:
+        # Keeps the chain of algorithms the generation fell back to, e.g. from Aldous-Broder to Wilson to Prim.
+        generator.fallback = 'random_prim' if generator.fallback is None else generator.fallback + ',random_prim'
+
+        start_time = perf_counter()
+        num_cells = _grow_with_prim(generator.map, cell_states, width)
+
+        # The measured cost is used to decide when later generations fall back.
+        if num_cells >= MIN_MEASURED_FALLBACK_CELLS:
+            Generator.fallback_seconds_per_cell = (perf_counter() - start_time) / num_cells
+
+
+
+def _grow_with_prim(maze_map, cell_states, width):
+    """
+    Function adding every unvisited cell to the maze with a parallel variant of the randomized Prim (cell-based)
+    algorithm, in time linear in the number of cells. In each round, every unvisited neighbour of the maze is added
+    with probability one half, linked to one of its neighbours in maze chosen randomly, which grows the maze in the
+    same irregular way as adding them one at a time. Rounds run on whole arrays, and carve their walls in bulk.
+    Returns the number of cells added.
+    """
+
+    offsets = np.array([-width, +width, -1, +1], dtype = np.intp)
+
+    # Shuffles with a NumPy generator seeded from the random module, so that seeding the random module still
+    # makes generation reproducible.
+    rng = np.random.default_rng(random.getrandbits(64))
+
+    states = np.frombuffer(cell_states, dtype = np.uint8)
+    frontier = np.flatnonzero(states == IN_MAZE)
+    num_cells = 0
+
+    while len(frontier):
+        is_unvisited = states[frontier[:, np.newaxis] + offsets] == UNVISITED
+
+        # Cells of the frontier without unvisited neighbours will never have any.
+        has_unvisited_neighbour = is_unvisited.any(axis = 1)
+        frontier, is_unvisited = frontier[has_unvisited_neighbour], is_unvisited[has_unvisited_neighbour]
+
+        # Links from cells of the frontier to their unvisited neighbours, each kept with probability one half.
+        link_cells, link_directions = np.nonzero(is_unvisited & (rng.random(is_unvisited.shape) < 0.5))
+
+        # Keeps one random link to each new cell.
+        order = rng.permutation(len(link_cells))
+        link_cells, link_directions = frontier[link_cells[order]], link_directions[order]
+        new_cells, first_links = np.unique(link_cells + offsets[link_directions], return_index = True)
+        link_cells, link_directions = link_cells[first_links], link_directions[first_links]
+
+        rows, cols = np.divmod(link_cells - width - 1, width)
+        wall_ids = maze_map.get_wall_ids(WALL_ORIENTS[link_directions], rows + WALL_ROW_OFFSETS[link_directions],
+                                         cols + WALL_COL_OFFSETS[link_directions])
+        maze_map.set_walls_by_id(wall_ids, value = False)
+
+        states[new_cells] = IN_MAZE
+        frontier = np.concatenate((frontier, new_cells))
+        num_cells += len(new_cells)
+
+    return num_cells
 
 
 
@@ -44,67 +207,15 @@ class Wilson(Generator):
     This algorithm samples in an unbiased way a random maze from the uniform
     distribution over all mazes. However, on large maze sizes, the generation
     time may be extremely long, as it implements a loop-erasing random walk.
+    Loops are erased implicitly by only remembering the last direction in which 
+    the walk exited each cell, and the walk is carved only once it reaches the maze.
+    Once the time budget of the generation is exceeded, the remaining cells are
+    added with the randomized Prim algorithm, which makes the maze biased.
     """
 
     def _generate_implementation(self):
+        self.map = self._new_map(init_all_walls_up = True)
+
+        grow_uniform_spanning_tree(self)
 
-        inverse_direction = {Direction.UP: Direction.DOWN,
-                             Direction.DOWN: Direction.UP,
-                             Direction.RIGHT: Direction.LEFT,
-                             Direction.LEFT: Direction.RIGHT}
-
-        map_rows, map_cols = self.dimention
-        
-        self.map = Map(self.dimention, init_all_walls_up = True)
-
-        unvisited_cells = set(Cell(row, col) for row in range(map_rows) for col in range(map_cols))
-
-        # Initialize maze with one cell chosen randomly.
-        unvisited_cells.remove(Cell(random.randrange(map_rows), random.randrange(map_cols)))
-
-        while unvisited_cells:
-            current_cell, = random.sample(unvisited_cells, k=1)
-            walk_cells = ListSetHybrid([current_cell])
-            walk_directions = []
-
-            direction, next_cell = random.choice(self.map.get_valid_neighbours(current_cell))
-            while current_cell in unvisited_cells:
-                neighbours_next_cell = self.map.get_valid_neighbours(next_cell, direction)
-
-                # Check if loop was made.
-                loop_made = False
-                for _, neighbour in neighbours_next_cell:
-                    if neighbour in walk_cells:
-                        loop_made = True
-
-                        # Undo changes to map.
-                        prev_last_cell = None
-                        last_cell = walk_cells.pop()
-                        while last_cell != neighbour:
-                            last_direction = walk_directions.pop()
-
-                            opposite_last_direction = inverse_direction[last_direction]
-                            self.map.set_wall_of_cell(last_cell, opposite_last_direction, value = True)
-
-                            prev_last_cell = last_cell
-                            last_cell = walk_cells.pop()
-                            
-                        # Put variables back in correct state.
-                        current_cell = last_cell
-                        walk_cells.append(last_cell)
-                        next_cell = prev_last_cell
-                        direction = last_direction
-
-                # If no loop found, proceed as normal.
-                if not loop_made:
-                    self.map.set_wall_of_cell(current_cell, direction, value = False)
-                    
-                    walk_cells.append(next_cell)
-                    walk_directions.append(direction)
-                    current_cell = next_cell
-                    direction, next_cell = random.choice(neighbours_next_cell)
-
-            unvisited_cells -= walk_cells.get_set()
-
-
-        return self
\ No newline at end of file
+        return self
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+"""
+Metrics of maze generation and solving runs: time spent in each phase of a run and counters of the work done,
+sent once the run ends to sinks, which are callables receiving a record dictionary.
+"""
+
+import cProfile
+import json
+from contextlib import contextmanager
+from time import perf_counter
+
+
+def print_sink(record):
+    """
+    Sink printing a record as a summary line, followed by its phases and counters.
+    """
+
+    print(f"{record['label']} in {record['seconds']:.5f} seconds.")
+
+    if len(record['phases']) > 1:
+        print('    ' + ', '.join(f'{phase} {seconds:.5f}s' for phase, seconds in record['phases'].items()))
+
+    if record['counters']:
+        print('    ' + ', '.join(f'{counter} {value}' for counter, value in record['counters'].items()))
+
+
+class JsonLinesSink:
+    """
+    Sink appending each record as a line of JSON to a file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def __call__(self, record):
+        with open(self.path, 'a') as file:
+            file.write(json.dumps(record) + '\n')
+
+
+class MetricsCollector:
+    """
+    Class collecting the phases timings and counters of one run at a time. Phases can be nested, in which case
+    time spent in inner phases is not counted in outer ones. Without sinks, records are printed if the run is
+    verbose. If a profile path is given, runs are also profiled with cProfile, and statistics of all runs so far
+    are dumped to that path at the end of each run, readable with the pstats module.
+    """
+
+    def __init__(self, sinks = None, profile_path = None):
+        self.sinks = sinks
+        self.profile_path = profile_path
+
+        self._run = None
+        self._profile = cProfile.Profile() if profile_path is not None else None
+
+    def start_run(self, run, label, **fields):
+        if self._run is not None:
+            raise RuntimeError(f"Run {run!r} started while run {self._run['run']!r} is still in progress.")
+
+        self._run = {'run': run, 'label': label, **fields, 'seconds': 0.0, 'phases': {}, 'counters': {}}
+        self._phase_stack = []
+        self._start_time = perf_counter()
+
+        if self._profile is not None:
+            self._profile.enable()
+
+    @contextmanager
+    def run(self, run, label, verbose = True, **fields):
+        """
+        Context manager wrapping a run between start_run and end_run. If the body raises, the run is stopped
+        without being sent to sinks, so that the collector is ready for the next run.
+        """
+
+        self.start_run(run, label, **fields)
+        try:
+            yield
+        except BaseException:
+            self._stop_run()
+            raise
+
+        self.end_run(verbose)
+
+    @contextmanager
+    def phase(self, name):
+        """Context manager timing a phase of the current run. Does nothing outside of runs."""
+
+        if self._run is None:
+            yield
+            return
+
+        # Phases are listed in the order they start. Each entry of the stack holds the time spent in its inner phases.
+        self._run['phases'].setdefault(name, 0.0)
+        self._phase_stack.append(0.0)
+        start_time = perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_time = perf_counter() - start_time
+            inner_time = self._phase_stack.pop()
+
+            phases = self._run['phases']
+            phases[name] += elapsed_time - inner_time
+
+            if self._phase_stack:
+                self._phase_stack[-1] += elapsed_time
+
+    def update(self, **fields):
+        """Sets fields of the record of the current run. Does nothing outside of runs."""
+
+        if self._run is not None:
+            self._run.update(fields)
+
+    def count(self, name, value = 1):
+        """Adds value to a counter of the current run. Does nothing outside of runs."""
+
+        if self._run is not None:
+            counters = self._run['counters']
+            counters[name] = counters.get(name, 0) + value
+
+    def _stop_run(self):
+        """Stops timing and profiling the current run, and returns its record."""
+
+        record = self._run
+        record['seconds'] = perf_counter() - self._start_time
+        self._run = None
+
+        if self._profile is not None:
+            self._profile.disable()
+            self._profile.dump_stats(self.profile_path)
+
+        return record
+
+    def peak(self, name, value):
+        """Keeps the largest value of a counter of the current run. Does nothing outside of runs."""
+
+        if self._run is not None:
+            counters = self._run['counters']
+            counters[name] = max(counters.get(name, value), value)
+
+    def end_run(self, verbose = True):
+        """Ends the current run and sends its record to sinks, which it also returns."""
+
+        record = self._stop_run()
+
+        sinks = self.sinks if self.sinks is not None else ([print_sink] if verbose else [])
+        for sink in sinks:
+            sink(record)
+
+        return record
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+import argparse
+import sys
+from time import time
+
+from solvers.tree_index import MazeTree
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = 'Program answering path queries on a perfect maze. The maze is loaded and indexed once, '
+                                                   'then each line "START_ROW START_COL END_ROW END_COL" read from standard input is answered '
+                                                   'with the length of the path between the two cells (in moves between adjacent cells).')
+    parser.add_argument('--input', '-i', type = str, nargs = 1, default = None, required = True,
+                        help = 'The image or .maze file containing the maze.')
+    parser.add_argument('--paths', '-p', action = 'store_true',
+                        help = 'Also print the cells of each path, as ROW,COL pairs.')
+
+    args = parser.parse_args()
+    args.input, = args.input
+
+    start_time = time()
+    tree = MazeTree.from_file(args.input)
+    print(f'Indexed {tree.dimention[0]}x{tree.dimention[1]} maze in {time()-start_time:.5f} seconds.', file = sys.stderr)
+
+    num_queries = 0
+    start_time = time()
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+
+        start_row, start_col, end_row, end_col = map(int, line.split())
+
+        if args.paths:
+            path = tree.path((start_row, start_col), (end_row, end_col))
+            print(len(path) - 1, ' '.join(f'{row},{col}' for row, col in path))
+        else:
+            print(tree.path_length((start_row, start_col), (end_row, end_col)))
+
+        num_queries += 1
+
+    elapsed_time = time() - start_time
+    print(f'Answered {num_queries} queries in {elapsed_time:.5f} seconds.', file = sys.stderr)
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+import argparse
+from time import time
+
+from generators.event_log import EventLogReader
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = 'Program replaying the event log of a maze generation, written by generate.py --event-log, '
+                                                   'as an animated GIF or as a sequence of images.')
+    parser.add_argument('--input'    , '-i', type = str, nargs = 1, default = None, required = True,
+                        help = 'The event log to replay.')
+    parser.add_argument('--output'   , '-o', type = str, nargs = 1, default = None, required = True,
+                        help = 'The animated .gif image to write, or a pattern containing {index} to write each frame as an image.')
+    parser.add_argument('--frames'   , '-f', type = int, default = 100, required = False,
+                        help = 'Number of frames after the initial one, among which events are split evenly.')
+    parser.add_argument('--duration' , type = int, default = 40, required = False,
+                        help = 'Duration of each frame of the animation, in milliseconds.')
+
+    args = parser.parse_args()
+    args.input,  = args.input
+    args.output, = args.output
+
+    if args.frames < 1:
+        raise ValueError("Number of frames must be positive.")
+
+    is_gif = args.output.lower().endswith('.gif')
+    if not is_gif and '{index}' not in args.output:
+        raise ValueError("Output must be a .gif image or contain {index}.")
+
+    log = EventLogReader(args.input)
+    events_per_frame = max(1, -(-len(log) // args.frames))
+
+    print(f'Replaying {len(log)} events of {log.dimention[0]}x{log.dimention[1]} maze...')
+    start_time = time()
+
+    if is_gif:
+        log.save_gif(args.output, events_per_frame, args.duration)
+    else:
+        log.save_frames(args.output, events_per_frame)
+
+    print(f'Replayed {len(log)} events of {log.dimention[0]}x{log.dimention[1]} maze in {time()-start_time:.5f} seconds.')
@@ -4,6 +4,7 @@ import argparse
 import random
 from os import path
 
+from metrics import MetricsCollector, JsonLinesSink, print_sink
 from solvers import SOLVER_ALGORITHMS, get_solver_constructor
 
 
@@ -18,14 +19,23 @@ def _check_args(args):
     # Check path of solved maze argument.
     if args.output is None:
         directory, filename = path.split(args.input)
+
+        # Solutions of mazes read from maze files are drawn as images.
+        if filename.lower().endswith('.maze'):
+            filename = path.splitext(filename)[0] + '.png'
+
         args.output = path.join(directory, 'solved_' + filename)
 
     else:
         args.output, = args.output
 
-    # Check of algorithm argument.
+    # Check of algorithm argument. With contracted corridors, only algorithms able to run on them are allowed.
+    algorithms = SOLVER_ALGORITHMS
+    if args.contract:
+        algorithms = [algorithm for algorithm in algorithms if get_solver_constructor(algorithm)().supports_contracted_corridors()]
+
     if args.algorithm is None:
-         args.algorithm = random.choice(SOLVER_ALGORITHMS)
+         args.algorithm = random.choice(algorithms)
 
     else:
         args.algorithm, = args.algorithm
@@ -33,6 +43,9 @@ def _check_args(args):
         if args.algorithm not in SOLVER_ALGORITHMS:
             raise ValueError(f"Unknown algorithm to solve maze selected. Must be one of {', '.join(SOLVER_ALGORITHMS)}.")
 
+        elif args.algorithm not in algorithms:
+            raise ValueError(f"Algorithm {args.algorithm} can not solve contracted corridors. Must be one of {', '.join(algorithms)}.")
+
     return args
     
 
@@ -42,13 +55,24 @@ def _check_args(args):
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description = 'Program solving a maze provided as an image.')
     parser.add_argument('--input' , '-i', type = str, nargs = 1, default = None, required = True,
-                        help = 'The image containing the maze to solve.')
+                        help = 'The image containing the maze to solve, or a .maze file in native binary format.')
     parser.add_argument('--output', '-o', type = str, nargs = 1, default = None, required = False,
                         help = 'The image in which the solved maze will be drawn.')
     parser.add_argument('--algorithm', '-a', type = str, nargs = 1, default = None, required = False,
                         help = 'Algorithm to use to solve the maze.')
     
+    parser.add_argument('--contract', '-c', action = 'store_true',
+                        help = 'Contract corridors into a weighted graph of junctions before solving. The graph is cached next to the input maze.')
+    
+    parser.add_argument('--metrics', '-m', type = str, default = None, required = False,
+                        help = 'JSON lines file to which timings of each phase and counters of the search are appended, besides being printed.')
+    parser.add_argument('--profile', type = str, default = None, required = False,
+                        help = 'File to which cProfile statistics are dumped, readable with the pstats module.')
+
     args = parser.parse_args()
     args = _check_args(args)
-    
-    get_solver_constructor(args.algorithm)().solve(args.input).save_solution_as_img(args.output)
\ No newline at end of file
+
+    solver = get_solver_constructor(args.algorithm)()
+    solver.metrics = MetricsCollector(None if args.metrics is None else [print_sink, JsonLinesSink(args.metrics)], args.profile)
+
+    solver.solve(args.input, contract_corridors = args.contract).save_solution_as_img(args.output)
\ No newline at end of file
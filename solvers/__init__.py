@@ -1,22 +1,106 @@
 # -*- coding: utf-8 -*-
 
-from .a_star import AStar, PriorityQueue
-from .dijkstra import Dijkstra
-from .breadth_first_search import BreadthFirstSearch
+"""
+Registry of maze solving algorithms. Modules implementing algorithms are only imported the first time
+their constructor or class is requested, so that importing the package stays cheap. Other packages can
+register solving algorithms through entry points of the 'mazes.solvers' group, whose names are added
+to SOLVER_ALGORITHMS and which must point to Solver classes constructible without arguments.
+"""
 
+from importlib import import_module
 
-__solver_constructor = {'a_star'               : AStar,
-                        'a_star_linked_list'   : lambda: AStar(PriorityQueue.ORDERED_DOUBLE_LINKED_LIST),
-                        'a_star_binary_heap'   : lambda: AStar(PriorityQueue.BINARY_HEAP),
-                        'a_star_bucket_queue'  : lambda: AStar(PriorityQueue.BUCKET_QUEUE),
-                        'dijkstra'             : Dijkstra,
-                        'dijkstra_linked_list' : lambda: Dijkstra(PriorityQueue.ORDERED_DOUBLE_LINKED_LIST),
-                        'dijkstra_binary_heap' : lambda: Dijkstra(PriorityQueue.BINARY_HEAP),
-                        'dijkstra_bucket_queue': lambda: Dijkstra(PriorityQueue.BUCKET_QUEUE),
-                        'breadth_first_search' : BreadthFirstSearch}
 
+# Entry point group through which other packages register solving algorithms.
+ENTRY_POINT_GROUP = 'mazes.solvers'
 
-SOLVER_ALGORITHMS = list(__solver_constructor.keys())
+# Module of each class or function exported by the package, imported on first access.
+__lazy_attributes = {'AStar'                          : '.a_star',
+                     'PriorityQueue'                  : '.a_star',
+                     'Dijkstra'                       : '.dijkstra',
+                     'BreadthFirstSearch'             : '.breadth_first_search',
+                     'propagate_wavefront'            : '.wavefront',
+                     'BidirectionalAStar'             : '.bidirectional_a_star',
+                     'BidirectionalBreadthFirstSearch': '.bidirectional_breadth_first_search',
+                     'JumpPointSearch'                : '.jump_point_search',
+                     'DeadEndFilling'                 : '.dead_end_filling',
+                     'LifelongPlanningAStar'          : '.lifelong_planning_a_star'}
 
 
-get_solver_constructor = lambda algorithm: __solver_constructor[algorithm]
\ No newline at end of file
+def _load(attribute):
+    return getattr(import_module(__lazy_attributes[attribute], __name__), attribute)
+
+
+def _with_queue(solver_class, priority_queue):
+    """Returns a constructor of the solver class using the priority queue, both given by name."""
+
+    return lambda: _load(solver_class)(_load('PriorityQueue')[priority_queue])
+
+
+__solver_constructor = {'a_star'                            : 'AStar',
+                        'a_star_linked_list'                : _with_queue('AStar', 'ORDERED_DOUBLE_LINKED_LIST'),
+                        'a_star_binary_heap'                : _with_queue('AStar', 'BINARY_HEAP'),
+                        'a_star_bucket_queue'               : _with_queue('AStar', 'BUCKET_QUEUE'),
+                        'dijkstra'                          : 'Dijkstra',
+                        'dijkstra_linked_list'              : _with_queue('Dijkstra', 'ORDERED_DOUBLE_LINKED_LIST'),
+                        'dijkstra_binary_heap'              : _with_queue('Dijkstra', 'BINARY_HEAP'),
+                        'dijkstra_bucket_queue'             : _with_queue('Dijkstra', 'BUCKET_QUEUE'),
+                        'breadth_first_search'              : 'BreadthFirstSearch',
+                        'breadth_first_search_wavefront'    : lambda: _load('BreadthFirstSearch')(wavefront = True),
+                        'bidirectional_a_star'              : 'BidirectionalAStar',
+                        'bidirectional_a_star_linked_list'  : _with_queue('BidirectionalAStar', 'ORDERED_DOUBLE_LINKED_LIST'),
+                        'bidirectional_a_star_binary_heap'  : _with_queue('BidirectionalAStar', 'BINARY_HEAP'),
+                        'bidirectional_a_star_bucket_queue' : _with_queue('BidirectionalAStar', 'BUCKET_QUEUE'),
+                        'bidirectional_breadth_first_search': 'BidirectionalBreadthFirstSearch',
+                        'jump_point_search'                 : 'JumpPointSearch',
+                        'jump_point_search_linked_list'     : _with_queue('JumpPointSearch', 'ORDERED_DOUBLE_LINKED_LIST'),
+                        'jump_point_search_binary_heap'     : _with_queue('JumpPointSearch', 'BINARY_HEAP'),
+                        'jump_point_search_bucket_queue'    : _with_queue('JumpPointSearch', 'BUCKET_QUEUE'),
+                        'dead_end_filling'                  : 'DeadEndFilling',
+                        'lifelong_planning_a_star'          : 'LifelongPlanningAStar'}
+
+# Names exported by star imports, which load every class of the package as they are only resolved by __getattr__.
+__all__ = ['ENTRY_POINT_GROUP', 'SOLVER_ALGORITHMS', 'get_solver_constructor', *__lazy_attributes]
+
+__entry_points = None
+
+
+def _get_entry_points():
+    """Returns entry points of solving algorithms registered by other packages, discovered once."""
+
+    global __entry_points
+
+    if __entry_points is None:
+        from importlib.metadata import entry_points
+
+        # Entry points are grouped in a dictionary up to Python 3.9, and selected by group from Python 3.10.
+        all_entry_points = entry_points()
+        if hasattr(all_entry_points, 'select'):
+            group = all_entry_points.select(group = ENTRY_POINT_GROUP)
+        else:
+            group = all_entry_points.get(ENTRY_POINT_GROUP, [])
+
+        __entry_points = {entry_point.name: entry_point for entry_point in group if entry_point.name not in __solver_constructor}
+
+    return __entry_points
+
+
+def get_solver_constructor(algorithm):
+    if algorithm in __solver_constructor:
+        constructor = __solver_constructor[algorithm]
+        return _load(constructor) if isinstance(constructor, str) else constructor
+
+    entry_points = _get_entry_points()
+    if algorithm in entry_points:
+        return entry_points[algorithm].load()
+
+    raise KeyError(algorithm)
+
+
+def __getattr__(name):
+    if name == 'SOLVER_ALGORITHMS':
+        return list(__solver_constructor.keys()) + list(_get_entry_points().keys())
+
+    if name in __lazy_attributes:
+        return _load(name)
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -1,17 +1,20 @@
 # -*- coding: utf-8 -*-
 
 
-from collections import defaultdict
+from array import array as array_type
 from dataclasses import dataclass, field
 from enum import IntEnum
 import heapq
 
-from .solver import Solver
+from .solver import Solver, CellState, Cell
 
 
 # Define constants for possible priority queues usable by the A* and Dijkstra algorihthms.
 PriorityQueue = IntEnum('PriorityQueue', ['ORDERED_DOUBLE_LINKED_LIST', 'BINARY_HEAP', 'BUCKET_QUEUE'])
 
+# Distance of pixels not reached yet by search.
+UNREACHED = 2**31 - 1
+
 
 class Node:
     """Class used to identify a node in the Double Linked List class."""
@@ -122,36 +125,68 @@ class BinaryHeap:
         elem = heapq.heappop(self.q)
         return elem.priority, elem.item
 
+    def peek_first(self):
+        elem = self.q[0]
+        return elem.priority, elem.item
+
 
 
 
 class BucketQueue:
     """
-    Class implementing a bucket queue using a dictionary.
+    Class implementing a monotone bucket queue (Dial's algorithm) using a circular array of buckets.
+    Each bucket holds elements of a single priority, and a cursor moves forward to the minimum priority.
+    Priorities added must never be lower than the last popped one (or than the first one ever added),
+    which holds for A* with a consistent heuristic and for Dijkstra. The array grows whenever a priority too far ahead of the cursor is added,
+    so pops are amortized O(1) when priorities only span a small range ahead of the minimum, as in mazes.
     """
     
-    def __init__(self):
-        self.buckets = {}
+    def __init__(self, num_buckets = 8):
+        self.buckets = [[] for _ in range(num_buckets)]
+        self.min_priority = None
+        self.len = 0
 
     def add(self, priority, data = None):
-        if priority in self.buckets:
-            self.buckets[priority].append(data)
-        else:
-            self.buckets[priority] = [data]
+        # Cursor starts at first priority ever added.
+        if self.min_priority is None:
+            self.min_priority = priority
+
+        elif priority < self.min_priority:
+            raise ValueError(f'Priority {priority} lower than minimum priority {self.min_priority} of monotone bucket queue.')
+
+        if priority - self.min_priority >= len(self.buckets):
+            self._grow(priority - self.min_priority + 1)
+
+        self.buckets[priority % len(self.buckets)].append(data)
+        self.len += 1
+
+    def _grow(self, min_num_buckets):
+        num_buckets = len(self.buckets)
+        new_num_buckets = num_buckets
+        while new_num_buckets < min_num_buckets:
+            new_num_buckets *= 2
+
+        # Buckets hold priorities in range [min_priority, min_priority + num_buckets), one each.
+        new_buckets = [[] for _ in range(new_num_buckets)]
+        for priority in range(self.min_priority, self.min_priority + num_buckets):
+            new_buckets[priority % new_num_buckets] = self.buckets[priority % num_buckets]
+
+        self.buckets = new_buckets
 
     def __bool__(self):
-        return bool(self.buckets)
+        return self.len > 0
 
     def pop_first(self):
-        min_priority = min(self.buckets.keys())
-        min_priority_bucket = self.buckets[min_priority]
-        
-        element = min_priority_bucket.pop()
+        if self.len <= 0:
+            raise IndexError('pop_first from empty bucket queue.')
+
+        num_buckets = len(self.buckets)
+        while not self.buckets[self.min_priority % num_buckets]:
+            self.min_priority += 1
 
-        if not min_priority_bucket:
-            del self.buckets[min_priority]
+        self.len -= 1
 
-        return min_priority, element
+        return self.min_priority, self.buckets[self.min_priority % num_buckets].pop()
 
 
 
@@ -159,8 +194,13 @@ class BucketQueue:
 class AStar(Solver):
     """
     Child Solver class implementing the A* Maze solving algorithm, using L1 distance as heuristic.
+    The search runs on flat integer pixel ids (row * width + col) with preallocated distance and
+    predecessor arrays, and neighbours are reached by adding precomputed offsets to pixel ids.
     """
 
+    # Whether the L1 distance to end is added to priorities. Disabling it turns A* into Dijkstra.
+    use_heuristic = True
+
     def __init__(self, priority_queue_type = PriorityQueue.ORDERED_DOUBLE_LINKED_LIST):
         super().__init__()
 
@@ -171,45 +211,156 @@ class AStar(Solver):
         self.priority_queue_type = priority_queue_dict[priority_queue_type]
 
 
-    def _compute_priority(self, distance, cell, end):
-        # This A* implementation uses L1 distance as heuristic.
-        return distance + abs(cell.row - end.row) + abs(cell.col - end.col)
+    def _count_queue_operations(self, pushes, pops, stale_skips, peak_queue_size):
+        """Reports counters of priority queue operations of last search to metrics."""
 
+        self.metrics.count('queue_pushes', pushes)
+        self.metrics.count('queue_pops', pops)
+        self.metrics.count('stale_skips', stale_skips)
+        self.metrics.peak('peak_queue_size', peak_queue_size)
 
     def _solve_implementation(self, array, start, end):
-        distances = defaultdict(lambda: float('inf'))
-        previous = defaultdict(lambda: None)
+        height, width = array.shape
+        num_nodes = height * width
+
+        # Maze images are surrounded by walls, so adding an offset to a walkable pixel never leaves the image.
+        walkable = (array != CellState.WALL).tobytes()
+        offsets = (width, -width, 1, -1)
+
+        distances = array_type('i', [UNREACHED]) * num_nodes
+        previous = array_type('i', [-1]) * num_nodes
+        closed = bytearray(num_nodes)
+        priority_queue = self.priority_queue_type()
+
+        use_heuristic = self.use_heuristic
+        start_node = start.row * width + start.col
+        end_node = end.row * width + end.col
+        end_row, end_col = end
+
+        distances[start_node] = 0
+        self.nodes_expanded = 0
+        priority_queue.add(abs(start.row - end_row) + abs(start.col - end_col) if use_heuristic else 0, start_node)
+
+        # Queue counters are kept in local variables, and reported to metrics once search ends.
+        pushes, pops, stale_skips, queue_size, peak_queue_size = 1, 0, 0, 1, 1
+
+        while priority_queue:
+            _, current_node = priority_queue.pop_first()
+            pops += 1
+            queue_size -= 1
+
+            # Nodes can be in queue multiple times. With a consistent heuristic, first pop is final.
+            if closed[current_node]:
+                stale_skips += 1
+                continue
+            closed[current_node] = 1
+            self.nodes_expanded += 1
+
+            if current_node == end_node:
+                break
+
+            # All moves between adjacent pixels have a distance of 1.
+            alternative_distance = distances[current_node] + 1
+
+            for offset in offsets:
+                neighbour = current_node + offset
+
+                if walkable[neighbour] and alternative_distance < distances[neighbour]:
+                    distances[neighbour] = alternative_distance
+                    previous[neighbour] = current_node
+
+                    if use_heuristic:
+                        neighbour_row, neighbour_col = divmod(neighbour, width)
+                        neighbour_priority = alternative_distance + abs(neighbour_row - end_row) + abs(neighbour_col - end_col)
+                    else:
+                        neighbour_priority = alternative_distance
+                        
+                    priority_queue.add(neighbour_priority, neighbour)
+                    pushes += 1
+                    queue_size += 1
+                    if queue_size > peak_queue_size:
+                        peak_queue_size = queue_size
+
+        self._count_queue_operations(pushes, pops, stale_skips, peak_queue_size)
+
+        if previous[end_node] < 0:
+            raise ValueError('No path exists between start and end of maze.')
+
+        with self.metrics.phase('path_reconstruction'):
+            self.solution = []
+            solution_node = previous[end_node]
+            while solution_node != start_node:
+                self.solution.append(Cell(*divmod(solution_node, width)))
+                solution_node = previous[solution_node]
+
+        return self
+
+
+    def _solve_graph_implementation(self, graph, start, end):
+        width = graph.width
+        adjacency = graph.adjacency
+
+        distances = {}
+        previous = {}
+        closed = set()
         priority_queue = self.priority_queue_type()
 
-        distances[start] = 0
-        previous[start] = None
-        priority_queue.add(self._compute_priority(distances[start], start, end), (distances[start], start))
+        use_heuristic = self.use_heuristic
+        start_node = start.row * width + start.col
+        end_node = end.row * width + end.col
+        end_row, end_col = end
+
+        distances[start_node] = 0
+        self.nodes_expanded = 0
+        priority_queue.add(abs(start.row - end_row) + abs(start.col - end_col) if use_heuristic else 0, start_node)
+
+        # Queue counters are kept in local variables, and reported to metrics once search ends.
+        pushes, pops, stale_skips, queue_size, peak_queue_size = 1, 0, 0, 1, 1
 
         while priority_queue:
-            _, (distance, current_cell) = priority_queue.pop_first()
+            _, current_node = priority_queue.pop_first()
+            pops += 1
+            queue_size -= 1
 
-            if distances[current_cell] != distance:
+            # Corridors are at least as long as the L1 distance between their ends, so heuristic stays consistent.
+            if current_node in closed:
+                stale_skips += 1
                 continue
+            closed.add(current_node)
+            self.nodes_expanded += 1
 
-            if current_cell == end:
+            if current_node == end_node:
                 break
 
-            for delta_distance, neighbour in self._get_neighbours(current_cell):
-                if self._is_walkable_cell(array, neighbour):
-                    alternative_distance = distances[current_cell] + delta_distance
+            for weight, neighbour in adjacency[current_node]:
+                alternative_distance = distances[current_node] + weight
 
-                    if alternative_distance < distances[neighbour]:
-                        distances[neighbour] = alternative_distance
-                        previous[neighbour] = current_cell
+                if alternative_distance < distances.get(neighbour, UNREACHED):
+                    distances[neighbour] = alternative_distance
+                    previous[neighbour] = current_node
 
-                        neighbour_priority = self._compute_priority(alternative_distance, neighbour, end)
+                    if use_heuristic:
+                        neighbour_row, neighbour_col = divmod(neighbour, width)
+                        neighbour_priority = alternative_distance + abs(neighbour_row - end_row) + abs(neighbour_col - end_col)
+                    else:
+                        neighbour_priority = alternative_distance
                         
-                        priority_queue.add(neighbour_priority, (alternative_distance, neighbour))
+                    priority_queue.add(neighbour_priority, neighbour)
+                    pushes += 1
+                    queue_size += 1
+                    if queue_size > peak_queue_size:
+                        peak_queue_size = queue_size
+
+        self._count_queue_operations(pushes, pops, stale_skips, peak_queue_size)
+
+        if end_node not in previous:
+            raise ValueError('No path exists between start and end of maze.')
+
+        with self.metrics.phase('path_reconstruction'):
+            nodes = [end_node]
+            while nodes[-1] != start_node:
+                nodes.append(previous[nodes[-1]])
 
-        self.solution = []
-        solution_cell = previous[end]
-        while solution_cell != start:
-            self.solution.append(solution_cell)
-            solution_cell = previous[solution_cell]
+            self._set_solution_from_graph_path(graph, nodes[::-1])
 
         return self
\ No newline at end of file
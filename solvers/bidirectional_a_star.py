@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+
+from array import array as array_type
+
+from .a_star import AStar, UNREACHED
+from .solver import Solver, CellState, Cell
+
+
+class BidirectionalAStar(AStar):
+    """
+    Child Solver class implementing a bidirectional A* Maze solving algorithm. One search runs from start
+    towards end and one from end towards start, each with its own priority queue, always expanding the side
+    with the fewest queued nodes. Both sides use the average of the L1 distances to their own target and from
+    the other side's target as heuristic, which keeps them consistent with each other, so search can stop as
+    soon as the priorities of both sides add up to twice the length of the shortest path found through an edge
+    linking them. Solving on contracted corridors is not supported.
+    """
+
+    # The search on contracted corridors inherited from AStar would not run this algorithm.
+    _solve_graph_implementation = Solver._solve_graph_implementation
+
+    def _solve_implementation(self, array, start, end):
+        height, width = array.shape
+        num_nodes = height * width
+
+        # Maze images are surrounded by walls, so adding an offset to a walkable pixel never leaves the image.
+        walkable = (array != CellState.WALL).tobytes()
+        offsets = (width, -width, 1, -1)
+
+        use_heuristic = self.use_heuristic
+        start_node = start.row * width + start.col
+        end_node = end.row * width + end.col
+
+        # Priorities are doubled so that they stay integers: 2 * distance + L1 to target - L1 to root.
+        # They never decrease along a move, and never go below 0, so all priority queues can be used.
+        def heuristic(node, target, root):
+            row, col = divmod(node, width)
+            return abs(row - target.row) + abs(col - target.col) - abs(row - root.row) - abs(col - root.col)
+
+        # Search state of each side: root, target, distances, predecessors, closed pixels, queue and its size.
+        sides = []
+        for root_node, root, target in ((start_node, start, end), (end_node, end, start)):
+            distances = array_type('i', [UNREACHED]) * num_nodes
+            previous = array_type('i', [-1]) * num_nodes
+            closed = bytearray(num_nodes)
+            priority_queue = self.priority_queue_type()
+
+            distances[root_node] = 0
+            priority_queue.add(heuristic(root_node, target, root) if use_heuristic else 0, root_node)
+            sides.append([root, target, distances, previous, closed, priority_queue, 1])
+
+        # Last priority popped on each side, a lower bound of priorities left in its queue.
+        last_priorities = [heuristic(start_node, end, start) if use_heuristic else 0,
+                           heuristic(end_node, start, end) if use_heuristic else 0]
+
+        # Length of shortest path found so far, and edge linking forward and backward sides on it.
+        best_length = UNREACHED
+        meeting = None
+
+        self.nodes_expanded = 0
+
+        # Queue counters of both sides are kept in local variables, and reported to metrics once search ends.
+        pushes, pops, stale_skips, peak_queue_size = 2, 0, 0, 2
+
+        while True:
+            side = 0 if sides[0][6] <= sides[1][6] else 1
+            root, target, distances, previous, closed, priority_queue, _ = sides[side]
+            other_distances = sides[1 - side][2]
+
+            if not priority_queue:
+                break
+            priority, current_node = priority_queue.pop_first()
+            sides[side][6] -= 1
+            pops += 1
+
+            # No path through nodes left in either queue can be shorter than the best one.
+            last_priorities[side] = priority
+            if best_length != UNREACHED and last_priorities[0] + last_priorities[1] >= 2 * best_length:
+                break
+
+            if closed[current_node]:
+                stale_skips += 1
+                continue
+            closed[current_node] = 1
+            self.nodes_expanded += 1
+
+            # All moves between adjacent pixels have a distance of 1.
+            alternative_distance = distances[current_node] + 1
+
+            for offset in offsets:
+                neighbour = current_node + offset
+
+                if not walkable[neighbour]:
+                    continue
+
+                if alternative_distance < distances[neighbour]:
+                    distances[neighbour] = alternative_distance
+                    previous[neighbour] = current_node
+
+                    neighbour_priority = 2 * alternative_distance
+                    if use_heuristic:
+                        neighbour_priority += heuristic(neighbour, target, root)
+
+                    priority_queue.add(neighbour_priority, neighbour)
+                    sides[side][6] += 1
+                    pushes += 1
+                    if sides[0][6] + sides[1][6] > peak_queue_size:
+                        peak_queue_size = sides[0][6] + sides[1][6]
+
+                # Neighbour reached by other side links both searches.
+                if other_distances[neighbour] != UNREACHED:
+                    length = alternative_distance + other_distances[neighbour]
+
+                    if length < best_length:
+                        best_length = length
+                        meeting = (current_node, neighbour) if side == 0 else (neighbour, current_node)
+
+        self._count_queue_operations(pushes, pops, stale_skips, peak_queue_size)
+
+        if meeting is None:
+            raise ValueError('No path exists between start and end of maze.')
+
+        # Join path from start to meeting edge with path from meeting edge to end.
+        with self.metrics.phase('path_reconstruction'):
+            forward_node, backward_node = meeting
+            forward_previous = sides[0][3]
+            backward_previous = sides[1][3]
+
+            path = []
+            while forward_node != start_node:
+                path.append(forward_node)
+                forward_node = forward_previous[forward_node]
+            path.reverse()
+
+            while backward_node != end_node:
+                path.append(backward_node)
+                backward_node = backward_previous[backward_node]
+
+            self.solution = [Cell(*divmod(node, width)) for node in path]
+
+        return self
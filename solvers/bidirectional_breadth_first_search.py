@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+
+from array import array as array_type
+
+from .breadth_first_search import BreadthFirstSearch
+from .solver import Solver, CellState, Cell
+
+
+# Side of the search which reached each pixel.
+UNREACHED, FORWARD, BACKWARD = range(3)
+
+
+class BidirectionalBreadthFirstSearch(BreadthFirstSearch):
+    """
+    Child Solver class implementing a bidirectional Breadth-First-Search Maze solving algorithm.
+    One search grows from start and one from end, a whole layer at a time, always expanding the side
+    with the smallest frontier. Search stops once the layer in which both sides first meet is complete,
+    and the shortest path through the meeting points found in that layer is as short as the one found by
+    Breadth-First-Search. Solving on contracted corridors is not supported.
+    """
+
+    # The search on contracted corridors inherited from BreadthFirstSearch would not run this algorithm.
+    _solve_graph_implementation = Solver._solve_graph_implementation
+
+    def _solve_implementation(self, array, start, end):
+        height, width = array.shape
+        num_nodes = height * width
+
+        # Maze images are surrounded by walls, so adding an offset to a walkable pixel never leaves the image.
+        walkable = (array != CellState.WALL).tobytes()
+        offsets = (width, -width, 1, -1)
+
+        start_node = start.row * width + start.col
+        end_node = end.row * width + end.col
+
+        # Side which reached each pixel, distance from start or end on that side, and previous pixel on that side.
+        sides = bytearray(num_nodes)
+        distances = array_type('i', [0]) * num_nodes
+        previous = array_type('i', [-1]) * num_nodes
+
+        sides[start_node] = FORWARD
+        sides[end_node] = BACKWARD
+        frontiers = {FORWARD: [start_node], BACKWARD: [end_node]}
+
+        self.nodes_expanded = 0
+        best_length = None
+        meeting = None
+
+        while meeting is None:
+            side = FORWARD if len(frontiers[FORWARD]) <= len(frontiers[BACKWARD]) else BACKWARD
+            other_side = BACKWARD if side == FORWARD else FORWARD
+
+            if not frontiers[side]:
+                raise ValueError('No path exists between start and end of maze.')
+
+            new_frontier = []
+            self.nodes_expanded += len(frontiers[side])
+
+            for node in frontiers[side]:
+                new_distance = distances[node] + 1
+
+                for offset in offsets:
+                    neighbour = node + offset
+
+                    if not walkable[neighbour]:
+                        continue
+
+                    if sides[neighbour] == UNREACHED:
+                        sides[neighbour] = side
+                        distances[neighbour] = new_distance
+                        previous[neighbour] = node
+                        new_frontier.append(neighbour)
+
+                    elif sides[neighbour] == other_side:
+                        length = new_distance + distances[neighbour]
+
+                        if best_length is None or length < best_length:
+                            best_length = length
+                            meeting = (node, neighbour) if side == FORWARD else (neighbour, node)
+
+            frontiers[side] = new_frontier
+
+        # Join path from start to meeting point of forward side with path from meeting point of backward side to end.
+        with self.metrics.phase('path_reconstruction'):
+            forward_node, backward_node = meeting
+
+            path = []
+            while forward_node != start_node:
+                path.append(forward_node)
+                forward_node = previous[forward_node]
+            path.reverse()
+
+            while backward_node != end_node:
+                path.append(backward_node)
+                backward_node = previous[backward_node]
+
+            self.solution = [Cell(*divmod(node, width)) for node in path]
+
+        return self
@@ -3,7 +3,10 @@
 
 from collections import namedtuple
 
-from .solver import Solver
+import numpy as np
+
+from .solver import Solver, CellState, Cell
+from .wavefront import propagate_wavefront
 
 
 # Define namedtuple used to identify a node in the tree class.
@@ -45,10 +48,21 @@ class SimpleTree:
 class BreadthFirstSearch(Solver):
     """
     Child Solver class implementing the Breadth-First-Search Maze solving algorithm.
+    On contracted corridors, the path found has the fewest junctions rather than the fewest pixels,
+    which makes no difference on perfect mazes where the path between start and end is unique.
+    In wavefront mode, the whole frontier is advanced at once with array operations, and the path is
+    recovered by following the move which reached each pixel back from end.
     """
 
+    def __init__(self, wavefront = False):
+        super().__init__()
+
+        self.wavefront = wavefront
+
     def _grow_tree(self, tree, visited, array, end):
         for leaf in tree.get_and_clear_leaves():
+            self.nodes_expanded += 1
+
             for _, neighbour in self._get_neighbours(leaf.cell):
                 
                 # If current leaf is a neighbour of end, early stop search.
@@ -61,6 +75,13 @@ class BreadthFirstSearch(Solver):
                     
 
     def _solve_implementation(self, array, start, end):
+        if self.wavefront:
+            return self._solve_wavefront_implementation(array, start, end)
+
+        # Memoryview provides much faster access to single elements than the array itself.
+        array = memoryview(array)
+
+        self.nodes_expanded = 0
 
         tree = SimpleTree()
         tree.add_leaf(start)
@@ -69,11 +90,70 @@ class BreadthFirstSearch(Solver):
 
         last_node = None
         while last_node is None:
+            if not tree.leaves:
+                raise ValueError('No path exists between start and end of maze.')
             last_node = self._grow_tree(tree, visited, array, end)
 
-        self.solution = tree.get_path(last_node)
+        with self.metrics.phase('path_reconstruction'):
+            self.solution = tree.get_path(last_node)
+
+            # Remove start from solution.
+            self.solution = self.solution[1:]
+
+        return self
+
+    def _solve_wavefront_implementation(self, array, start, end):
+        width = array.shape[1]
+        offsets = (width, -width, 1, -1)
+
+        distances, directions = propagate_wavefront(array != CellState.WALL, start, end)
+
+        if distances[end] < 0:
+            raise ValueError('No path exists between start and end of maze.')
+
+        # Every pixel closer to start than end was reached, as propagation stops after the step reaching end.
+        self.nodes_expanded = int(np.count_nonzero((distances >= 0) & (distances < distances[end])))
+
+        # Step back from end along the moves which reached each pixel.
+        with self.metrics.phase('path_reconstruction'):
+            directions = memoryview(directions.ravel())
+            start_node = start.row * width + start.col
+            solution_node = end.row * width + end.col - offsets[directions[end.row * width + end.col]]
+
+            self.solution = []
+            while solution_node != start_node:
+                self.solution.append(Cell(*divmod(solution_node, width)))
+                solution_node -= offsets[directions[solution_node]]
+            self.solution.reverse()
+
+        return self
+
+    def _solve_graph_implementation(self, graph, start, end):
+        start_node = start.row * graph.width + start.col
+        end_node = end.row * graph.width + end.col
+
+        previous = {start_node: None}
+        leaves = [start_node]
+        self.nodes_expanded = 0
+
+        while end_node not in previous:
+            new_leaves = []
+            self.nodes_expanded += len(leaves)
+            for leaf in leaves:
+                for _, neighbour in graph.adjacency[leaf]:
+                    if neighbour not in previous:
+                        previous[neighbour] = leaf
+                        new_leaves.append(neighbour)
+
+            if not new_leaves:
+                raise ValueError('No path exists between start and end of maze.')
+            leaves = new_leaves
+
+        with self.metrics.phase('path_reconstruction'):
+            nodes = [end_node]
+            while nodes[-1] != start_node:
+                nodes.append(previous[nodes[-1]])
 
-        # Remove start from solution.
-        self.solution = self.solution[1:]
+            self._set_solution_from_graph_path(graph, nodes[::-1])
 
         return self
\ No newline at end of file
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+
+import numpy as np
+
+
+# Environment variable which, if set, names a JSON file in which chosen colors are persisted across processes.
+DISK_CACHE_ENV_VARIABLE = 'MAZES_COLOR_CACHE'
+
+# Candidate colors are all combinations of these channel values.
+CANDIDATE_CHANNEL_VALUES = list(range(0, 256, 10)) + [255]
+
+
+_candidates_rgb = None
+_candidates_lab = None
+_memory_cache = {}
+_disk_cache = None
+
+
+def _rgb_to_lab(rgb_colors):
+    """
+    Converts an (N, 3) uint8 array of RGB colors to CIELAB colorspace with a single transform of an Nx1 image.
+    """
+
+    # Pillow's colour management module is slow to import, so it is only imported once colors are converted.
+    from PIL import Image, ImageCms
+
+    profile_rgb = ImageCms.createProfile("sRGB")
+    profile_lab = ImageCms.createProfile("LAB")
+
+    rgb_to_lab_transform = ImageCms.buildTransformFromOpenProfiles(profile_rgb, profile_lab, "RGB", "LAB")
+
+    image = Image.frombytes("RGB", (len(rgb_colors), 1), np.ascontiguousarray(rgb_colors, dtype = np.uint8).tobytes())
+    lab_image = ImageCms.applyTransform(image, rgb_to_lab_transform)
+
+    # Pillow stores the L channel as an unsigned byte and the a and b channels as signed bytes.
+    lab_bytes = np.asarray(lab_image).reshape(-1, 3)
+    lab_colors = lab_bytes.astype(np.float64)
+    lab_colors[:, 1:] = lab_bytes[:, 1:].view(np.int8)
+
+    return lab_colors
+
+
+def _get_candidates():
+    """
+    Returns RGB and LAB values of all candidate colors, computed on first call only.
+    """
+
+    global _candidates_rgb, _candidates_lab
+
+    if _candidates_rgb is None:
+        channel_values = np.array(CANDIDATE_CHANNEL_VALUES, dtype = np.uint8)
+        red, green, blue = np.meshgrid(channel_values, channel_values, channel_values, indexing = 'ij')
+
+        _candidates_rgb = np.stack((red.ravel(), green.ravel(), blue.ravel()), axis = 1)
+        _candidates_lab = _rgb_to_lab(_candidates_rgb)
+
+    return _candidates_rgb, _candidates_lab
+
+
+def _load_disk_cache():
+    global _disk_cache
+
+    if _disk_cache is None:
+        _disk_cache = {}
+        cache_path = os.environ.get(DISK_CACHE_ENV_VARIABLE)
+
+        if cache_path and os.path.isfile(cache_path):
+            with open(cache_path, 'r') as file:
+                _disk_cache = json.load(file)
+
+    return _disk_cache
+
+
+def _save_disk_cache():
+    cache_path = os.environ.get(DISK_CACHE_ENV_VARIABLE)
+
+    if cache_path:
+        with open(cache_path, 'w') as file:
+            json.dump(_disk_cache, file)
+
+
+def choose_different_color(colors):
+    """
+    Returns the candidate RGB color maximizing the sum of CIE76 Delta E to the colors passed as parameter.
+    Results are memoized for each set of colors in process and, if the MAZES_COLOR_CACHE environment variable
+    names a JSON file, on disk.
+    """
+
+    key = tuple(sorted(tuple(color) for color in colors))
+
+    if key in _memory_cache:
+        return _memory_cache[key]
+
+    disk_cache = _load_disk_cache()
+    disk_key = ';'.join(','.join(map(str, color)) for color in key)
+
+    if disk_key in disk_cache:
+        chosen_color = tuple(disk_cache[disk_key])
+
+    else:
+        candidates_rgb, candidates_lab = _get_candidates()
+        lab_colors = _rgb_to_lab(np.array(key, dtype = np.uint8))
+
+        # Compute CIE76 Delta E between each possible RGB color and each existing color.
+        # Sum distances for each possible rgb color computed over existing colors. 
+        color_distances = np.sqrt(((candidates_lab[:, np.newaxis, :] - lab_colors[np.newaxis, :, :])**2).sum(axis = 2)).sum(axis = 1)
+
+        chosen_color = tuple(candidates_rgb[np.argmax(color_distances)].tolist())
+
+        disk_cache[disk_key] = chosen_color
+        _save_disk_cache()
+
+    _memory_cache[key] = chosen_color
+
+    return chosen_color
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+
+import numpy as np
+
+from .breadth_first_search import BreadthFirstSearch
+from .solver import Solver, CellState, Cell
+
+
+class DeadEndFilling(BreadthFirstSearch):
+    """
+    Child Solver class implementing the Dead-End Filling Maze solving algorithm. Walkable pixels having a single
+    walkable neighbour, other than start and end, are filled all at once with whole-array operations, and only
+    the neighbours of filled pixels are checked for the next round, until no dead end is left. In perfect mazes
+    this leaves the corridor between start and end, which is then followed. Mazes with loops leave junctions on
+    it, in which case Breadth-First-Search runs on the pixels left. Solving on contracted corridors is not
+    supported.
+    """
+
+    # The search on contracted corridors inherited from BreadthFirstSearch would not run this algorithm.
+    _solve_graph_implementation = Solver._solve_graph_implementation
+
+    def _solve_implementation(self, array, start, end):
+        height, width = array.shape
+
+        # Maze images are surrounded by walls, so adding an offset to a walkable pixel never leaves the image.
+        walkable = array != CellState.WALL
+        offsets = np.array([width, -width, 1, -1])
+
+        # Number of walkable neighbours of each pixel.
+        degrees = np.zeros((height, width), dtype = np.uint8)
+        degrees[1:, :]  += walkable[:-1, :]
+        degrees[:-1, :] += walkable[1:, :]
+        degrees[:, 1:]  += walkable[:, :-1]
+        degrees[:, :-1] += walkable[:, 1:]
+
+        walkable = walkable.ravel()
+        degrees = degrees.ravel()
+
+        start_node = start.row * width + start.col
+        end_node = end.row * width + end.col
+
+        # Degrees of start and end never get down to 1, so they are never filled.
+        degrees[start_node] = degrees[end_node] = 2 * len(offsets)
+
+        self.nodes_expanded = 0
+        dead_ends = np.flatnonzero(walkable & (degrees == 1))
+
+        while dead_ends.size:
+            walkable[dead_ends] = False
+            self.nodes_expanded += dead_ends.size
+
+            neighbours = (dead_ends[:, np.newaxis] + offsets).ravel()
+            neighbours = neighbours[walkable[neighbours]]
+            np.subtract.at(degrees, neighbours, 1)
+
+            dead_ends = np.unique(neighbours[degrees[neighbours] == 1])
+
+        # Follow the corridor left from start, which has a single way forward at each pixel in perfect mazes.
+        remaining = walkable.tobytes()
+        path = []
+        previous_node, current_node = -1, start_node
+
+        while current_node != end_node:
+            next_nodes = [current_node + offset for offset in offsets.tolist()
+                          if remaining[current_node + offset] and current_node + offset != previous_node]
+
+            if len(next_nodes) != 1:
+                if not next_nodes:
+                    raise ValueError('No path exists between start and end of maze.')
+
+                # Loops are left in place by filling, so search among the pixels left.
+                filled = array.copy()
+                filled.ravel()[~walkable] = CellState.WALL
+                nodes_filled = self.nodes_expanded
+                super()._solve_implementation(filled, start, end)
+                self.nodes_expanded += nodes_filled
+
+                return self
+
+            previous_node, current_node = current_node, next_nodes[0]
+            path.append(current_node)
+            self.nodes_expanded += 1
+
+        self.solution = [Cell(*divmod(node, width)) for node in path[:-1]]
+
+        return self
@@ -9,5 +9,4 @@ class Dijkstra(AStar):
     Child Solver class implementing the Dijkstra Maze solving algorithm.
     """
 
-    def _compute_priority(self, distance, cell, end):
-        return distance
\ No newline at end of file
+    use_heuristic = False
\ No newline at end of file
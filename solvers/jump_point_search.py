@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+
+from array import array as array_type
+
+from .a_star import AStar, UNREACHED
+from .solver import Solver, CellState, Cell
+
+
+# Direction used to reach pixels from which every direction is searched.
+NO_DIRECTION = 4
+
+
+class JumpPointSearch(AStar):
+    """
+    Child Solver class implementing the Jump Point Search Maze solving algorithm on the 4-connected pixel grid.
+    From each jump point, search moves in straight lines without queueing the pixels it crosses, and stops at
+    the next pixel having a walkable neighbour perpendicular to the move (a turn or junction) or at end.
+    Straight lines running into a wall without such a pixel are dead ends and are pruned. Moves never go back
+    in the direction a jump point was reached from, as pixels behind it were reached sooner from its parent.
+    In maze images, pixels diagonal to a corridor are always walls, so this stopping rule matches the forced
+    neighbours of 4-connected JPS. Solving on contracted corridors is not supported.
+    """
+
+    # The search on contracted corridors inherited from AStar would not run this algorithm.
+    _solve_graph_implementation = Solver._solve_graph_implementation
+
+    def _solve_implementation(self, array, start, end):
+        height, width = array.shape
+        num_nodes = height * width
+
+        # Maze images are surrounded by walls, so adding an offset to a walkable pixel never leaves the image.
+        walkable = (array != CellState.WALL).tobytes()
+        offsets = (width, -width, 1, -1)
+        perpendicular_offsets = (1, 1, width, width)
+
+        distances = array_type('i', [UNREACHED]) * num_nodes
+        previous = array_type('i', [-1]) * num_nodes
+        directions = bytearray(num_nodes)
+        closed = bytearray(num_nodes)
+        priority_queue = self.priority_queue_type()
+
+        use_heuristic = self.use_heuristic
+        start_node = start.row * width + start.col
+        end_node = end.row * width + end.col
+        end_row, end_col = end
+
+        distances[start_node] = 0
+        directions[start_node] = NO_DIRECTION
+        self.nodes_expanded = 0
+        priority_queue.add(abs(start.row - end_row) + abs(start.col - end_col) if use_heuristic else 0, start_node)
+
+        # Queue counters are kept in local variables, and reported to metrics once search ends.
+        pushes, pops, stale_skips, queue_size, peak_queue_size = 1, 0, 0, 1, 1
+
+        while priority_queue:
+            _, current_node = priority_queue.pop_first()
+            pops += 1
+            queue_size -= 1
+
+            # Nodes can be in queue multiple times. With a consistent heuristic, first pop is final.
+            if closed[current_node]:
+                stale_skips += 1
+                continue
+            closed[current_node] = 1
+            self.nodes_expanded += 1
+
+            if current_node == end_node:
+                break
+
+            # Opposite directions have consecutive indices differing in their lowest bit.
+            backward_direction = directions[current_node] ^ 1
+            current_distance = distances[current_node]
+
+            for direction, offset in enumerate(offsets):
+                if direction == backward_direction:
+                    continue
+
+                perpendicular_offset = perpendicular_offsets[direction]
+                jump_node = current_node + offset
+                jump_distance = 1
+
+                # Move straight until a turn, a junction or end is found, or give up at a wall.
+                while walkable[jump_node]:
+                    if (jump_node == end_node or walkable[jump_node + perpendicular_offset]
+                            or walkable[jump_node - perpendicular_offset]):
+                        break
+                    jump_node += offset
+                    jump_distance += 1
+                else:
+                    continue
+
+                alternative_distance = current_distance + jump_distance
+
+                if alternative_distance < distances[jump_node]:
+                    distances[jump_node] = alternative_distance
+                    previous[jump_node] = current_node
+                    directions[jump_node] = direction
+
+                    if use_heuristic:
+                        jump_row, jump_col = divmod(jump_node, width)
+                        jump_priority = alternative_distance + abs(jump_row - end_row) + abs(jump_col - end_col)
+                    else:
+                        jump_priority = alternative_distance
+
+                    priority_queue.add(jump_priority, jump_node)
+                    pushes += 1
+                    queue_size += 1
+                    if queue_size > peak_queue_size:
+                        peak_queue_size = queue_size
+
+        self._count_queue_operations(pushes, pops, stale_skips, peak_queue_size)
+
+        if previous[end_node] < 0:
+            raise ValueError('No path exists between start and end of maze.')
+
+        # Fill straight lines between consecutive jump points, from end back to start.
+        with self.metrics.phase('path_reconstruction'):
+            self.solution = []
+            jump_node = end_node
+            while jump_node != start_node:
+                offset = offsets[directions[jump_node]]
+                solution_node = jump_node - offset
+                while solution_node != previous[jump_node]:
+                    self.solution.append(Cell(*divmod(solution_node, width)))
+                    solution_node -= offset
+                jump_node = solution_node
+                if jump_node != start_node:
+                    self.solution.append(Cell(*divmod(jump_node, width)))
+
+        return self
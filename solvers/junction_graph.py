@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+import os
+import zipfile
+from collections import defaultdict
+
+import numpy as np
+
+
+class JunctionGraph:
+    """
+    Class representing a maze as a weighted graph whose nodes are the junctions, dead ends, start and end of
+    the maze, and whose edges are the corridors linking them. Nodes are identified by their pixel id
+    (row * width + col), and each edge keeps the run of pixels making up its corridor so that paths found on
+    the graph can be expanded back to pixels. Edge weights are corridor lengths in pixels, so shortest paths
+    on the graph are shortest paths on pixels, and the L1 distance between nodes is a consistent heuristic.
+    """
+
+    def __init__(self, width, edges_u, edges_v, weights, runs_offsets, runs):
+        self.width = width
+        self.edges_u = edges_u
+        self.edges_v = edges_v
+        self.weights = weights
+        self.runs_offsets = runs_offsets
+        self.runs = runs
+
+        # Adjacency lists of (weight, neighbour) tuples.
+        self.adjacency = defaultdict(list)
+        for node_u, node_v, weight in zip(edges_u.tolist(), edges_v.tolist(), weights.tolist()):
+            self.adjacency[node_u].append((weight, node_v))
+            self.adjacency[node_v].append((weight, node_u))
+
+        # Index of edge linking each pair of nodes, only built when a path is first expanded.
+        self._edge_index = None
+
+    @property
+    def num_nodes(self):
+        return len(self.adjacency)
+
+    @classmethod
+    def from_walkable_mask(cls, walkable_mask, start, end):
+        """
+        Builds the graph from a boolean array telling if each pixel is walkable. Start and end are always nodes.
+        """
+
+        height, width = walkable_mask.shape
+
+        # Count walkable neighbours of each pixel with whole array shifts.
+        degrees = np.zeros(walkable_mask.shape, dtype = np.uint8)
+        degrees[1:, :]  += walkable_mask[:-1, :]
+        degrees[:-1, :] += walkable_mask[1:, :]
+        degrees[:, 1:]  += walkable_mask[:, :-1]
+        degrees[:, :-1] += walkable_mask[:, 1:]
+
+        nodes_mask = walkable_mask & (degrees != 2)
+        nodes_mask[start.row, start.col] = nodes_mask[end.row, end.col] = True
+
+        # Maze images are surrounded by walls, so adding an offset to a walkable pixel never leaves the image.
+        walkable = walkable_mask.tobytes()
+        is_node = nodes_mask.tobytes()
+        offsets = (width, -width, 1, -1)
+
+        # Follow each corridor leaving each node until another node is reached. Every corridor is followed from
+        # both of its ends, and recorded from the end with the smallest id only. Among parallel corridors, the
+        # shortest is kept.
+        edges = {}
+        for node in np.flatnonzero(nodes_mask).tolist():
+            for offset in offsets:
+                pixel = node + offset
+                if not walkable[pixel]:
+                    continue
+
+                previous_pixel = node
+                run = []
+                while not is_node[pixel]:
+                    run.append(pixel)
+                    for next_offset in offsets:
+                        next_pixel = pixel + next_offset
+                        if next_pixel != previous_pixel and walkable[next_pixel]:
+                            break
+                    previous_pixel, pixel = pixel, next_pixel
+
+                if node < pixel and ((node, pixel) not in edges or len(run) < len(edges[(node, pixel)])):
+                    edges[(node, pixel)] = run
+
+        edges_u = np.array([node_u for node_u, _ in edges], dtype = np.int64)
+        edges_v = np.array([node_v for _, node_v in edges], dtype = np.int64)
+        weights = np.array([len(run) + 1 for run in edges.values()], dtype = np.int64)
+        runs_offsets = np.concatenate(([0], np.cumsum(weights - 1))).astype(np.int64)
+        runs = np.array([pixel for run in edges.values() for pixel in run], dtype = np.int64)
+
+        return cls(width, edges_u, edges_v, weights, runs_offsets, runs)
+
+    @staticmethod
+    def maze_key(walkable_mask, start, end):
+        """
+        Returns the arrays identifying the maze a graph is built from: its shape, start, end and a hash of its
+        walkable pixels.
+        """
+
+        digest = hashlib.blake2b(np.ascontiguousarray(walkable_mask).view(np.uint8), digest_size = 16).digest()
+
+        return {'maze_shape' : np.array(walkable_mask.shape, dtype = np.int64),
+                'maze_start' : np.array(start, dtype = np.int64),
+                'maze_end'   : np.array(end, dtype = np.int64),
+                'maze_digest': np.frombuffer(digest, dtype = np.uint8)}
+
+    def save(self, path, maze_key = None):
+        """Saves the graph, along with the key of its maze if given (see maze_key)."""
+
+        with open(path, 'wb') as file:
+            np.savez(file, width = self.width, edges_u = self.edges_u, edges_v = self.edges_v, weights = self.weights,
+                     runs_offsets = self.runs_offsets, runs = self.runs, **(maze_key or {}))
+
+    @classmethod
+    def load(cls, path, maze_key = None):
+        """Loads a saved graph. If a maze key is given, returns None unless the graph was saved with that key."""
+
+        with np.load(path) as data:
+            if maze_key is not None and not all(name in data and np.array_equal(data[name], value)
+                                                for name, value in maze_key.items()):
+                return None
+
+            return cls(int(data['width']), data['edges_u'], data['edges_v'], data['weights'], data['runs_offsets'], data['runs'])
+
+    @classmethod
+    def for_file(cls, maze_path, walkable_mask, start, end):
+        """
+        Returns the graph of the maze stored at maze_path, loading it from a cache file next to the maze if it was
+        built from the same maze, with same shape, start, end and walkable pixels, else building it from
+        walkable_mask and caching it. Modification times are not trusted, as copies may keep them.
+        """
+
+        cache_path = os.fspath(maze_path) + '.junctions.npz'
+        maze_key = cls.maze_key(walkable_mask, start, end)
+
+        if os.path.isfile(cache_path):
+            try:
+                graph = cls.load(cache_path, maze_key)
+            except (OSError, ValueError, zipfile.BadZipFile):
+                graph = None
+
+            if graph is not None:
+                return graph
+
+        graph = cls.from_walkable_mask(walkable_mask, start, end)
+        graph.save(cache_path, maze_key)
+
+        return graph
+
+    def expand_path(self, nodes):
+        """
+        Converts a path given as a list of consecutive nodes into the list of all pixel ids along it.
+        """
+
+        if self._edge_index is None:
+            self._edge_index = {pair: edge for edge, pair in enumerate(zip(self.edges_u.tolist(), self.edges_v.tolist()))}
+
+        pixels = [nodes[0]]
+
+        for node_a, node_b in zip(nodes[:-1], nodes[1:]):
+            edge = self._edge_index[(min(node_a, node_b), max(node_a, node_b))]
+            run = self.runs[self.runs_offsets[edge]:self.runs_offsets[edge + 1]].tolist()
+
+            pixels.extend(run if node_a < node_b else run[::-1])
+            pixels.append(node_b)
+
+        return pixels
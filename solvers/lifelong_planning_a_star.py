@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+
+
+from array import array as array_type
+
+from .a_star import AStar, PriorityQueue, UNREACHED
+from .solver import CellState, Cell
+
+
+class LifelongPlanningAStar(AStar):
+    """
+    Child Solver class implementing the Lifelong Planning A* (LPA*) Maze solving algorithm, using L1 distance
+    as heuristic. Besides the distance of each pixel from start, LPA* keeps a one step lookahead of it computed
+    from its neighbours, and only pixels for which both differ are queued. After a first search, cells can be
+    opened or closed with update_cells, which only requeues the changed pixels and their neighbours, so that
+    repairing the solution costs in proportion to the part of the maze whose distances changed.
+    Keys are pairs compared lexicographically, so the priority queue is always a binary heap.
+    On contracted corridors, the A* search is used and update_cells is not available.
+    """
+
+    def __init__(self):
+        super().__init__(PriorityQueue.BINARY_HEAP)
+
+        self._distances = None
+        self._edited_cells = {}
+        self._contracted = False
+
+    def _solve_implementation(self, array, start, end):
+        height, width = array.shape
+        num_nodes = height * width
+
+        # Array is kept to be edited by later updates, and its walkable pixels are mirrored in a bytearray.
+        self._array = array.copy()
+        self._walkable = bytearray((self._array != CellState.WALL).tobytes())
+        self._width = width
+        self._offsets = (width, -width, 1, -1)
+        self._start_node = start.row * width + start.col
+        self._end_node = end.row * width + end.col
+        self._end = end
+
+        # Distance from start of each pixel, and one step lookahead of it based on its neighbours.
+        self._distances = array_type('i', [UNREACHED]) * num_nodes
+        self._lookaheads = array_type('i', [UNREACHED]) * num_nodes
+        self._priority_queue = self.priority_queue_type()
+        self._queue_size = 0
+        self._edited_cells = {}
+        self._contracted = False
+        self._reset_queue_counters()
+
+        self._lookaheads[self._start_node] = 0
+        self._add_to_queue(self._start_node)
+
+        self._compute_shortest_path()
+        self._set_solution()
+
+        return self
+
+    def _solve_graph_implementation(self, graph, start, end):
+        # The A* search on contracted corridors keeps no per pixel state which updates could repair.
+        self._distances = None
+        self._contracted = True
+
+        return super()._solve_graph_implementation(graph, start, end)
+
+    def update_cells(self, changes):
+        """
+        Applies an iterable of (cell, state) pairs, where cells are in pixel coordinates and states are
+        CellState.WALL or CellState.FREE, then repairs and returns the solution. The whole batch is checked
+        before any cell is changed, so that an invalid batch leaves the solver untouched.
+        """
+
+        if self._contracted:
+            raise RuntimeError("update_cells method is not supported after solving on contracted corridors.")
+
+        if self._distances is None:
+            raise RuntimeError("update_cells method called before solve method.")
+
+        height, width = self._array.shape
+        changes = [(Cell(*cell), state) for cell, state in changes]
+
+        for cell, state in changes:
+            if state not in (CellState.WALL, CellState.FREE):
+                raise ValueError(f'Cells can only be changed to {CellState.WALL.name} or {CellState.FREE.name}.')
+
+            if not (0 < cell.row < height - 1 and 0 < cell.col < width - 1):
+                raise ValueError(f'Cell {cell} is out of maze or on its border.')
+
+            if cell.row * width + cell.col in (self._start_node, self._end_node):
+                raise ValueError('Start and end of maze can not be changed.')
+
+        changed_nodes = []
+        self._reset_queue_counters()
+
+        for cell, state in changes:
+            node = cell.row * width + cell.col
+
+            self._array[cell] = state
+            self._walkable[node] = state != CellState.WALL
+            self._edited_cells[cell] = state
+            changed_nodes.append(node)
+
+        # Moves into and out of changed pixels have changed, which affects lookaheads of them and their neighbours.
+        affected_nodes = set(changed_nodes)
+        for node in changed_nodes:
+            affected_nodes.update(node + offset for offset in self._offsets)
+
+        for node in affected_nodes:
+            self._update_node(node)
+
+        self._compute_shortest_path()
+        self._set_solution()
+
+        return self.solution
+
+    def _reset_queue_counters(self):
+        # Queue counters of a search or update, reported to metrics once it ends.
+        self._pushes, self._pops, self._stale_skips, self._peak_queue_size = 0, 0, 0, self._queue_size
+
+    def _add_to_queue(self, node):
+        self._priority_queue.add(self._calculate_key(node), node)
+
+        self._pushes += 1
+        self._queue_size += 1
+        if self._queue_size > self._peak_queue_size:
+            self._peak_queue_size = self._queue_size
+
+    def _calculate_key(self, node):
+        row, col = divmod(node, self._width)
+        distance = min(self._distances[node], self._lookaheads[node])
+
+        return (distance + abs(row - self._end.row) + abs(col - self._end.col), distance)
+
+    def _update_node(self, node):
+        distances = self._distances
+        walkable = self._walkable
+
+        if node != self._start_node:
+            lookahead = UNREACHED
+            if walkable[node]:
+                for offset in self._offsets:
+                    neighbour = node + offset
+                    if walkable[neighbour] and distances[neighbour] < lookahead:
+                        lookahead = distances[neighbour]
+                lookahead = min(lookahead + 1, UNREACHED)
+            self._lookaheads[node] = lookahead
+
+        # Outdated entries are left in queue and skipped when popped.
+        if distances[node] != self._lookaheads[node]:
+            self._add_to_queue(node)
+
+    def _compute_shortest_path(self):
+        distances = self._distances
+        lookaheads = self._lookaheads
+        walkable = self._walkable
+        priority_queue = self._priority_queue
+        end_node = self._end_node
+
+        self.nodes_expanded = 0
+
+        while priority_queue:
+            key, node = priority_queue.peek_first()
+
+            # Entries of consistent nodes, or with keys changed since they were added, are outdated.
+            if distances[node] == lookaheads[node] or key != self._calculate_key(node):
+                priority_queue.pop_first()
+                self._pops += 1
+                self._stale_skips += 1
+                self._queue_size -= 1
+                continue
+
+            if key >= self._calculate_key(end_node) and distances[end_node] == lookaheads[end_node]:
+                break
+
+            priority_queue.pop_first()
+            self._pops += 1
+            self._queue_size -= 1
+            self.nodes_expanded += 1
+
+            if distances[node] > lookaheads[node]:
+                distances[node] = lookaheads[node]
+            else:
+                distances[node] = UNREACHED
+                self._update_node(node)
+
+            for offset in self._offsets:
+                neighbour = node + offset
+                if walkable[neighbour]:
+                    self._update_node(neighbour)
+
+        self._count_queue_operations(self._pushes, self._pops, self._stale_skips, self._peak_queue_size)
+
+    def _set_solution(self):
+        distances = self._distances
+        lookaheads = self._lookaheads
+        walkable = self._walkable
+
+        if distances[self._end_node] == UNREACHED:
+            self.solution = None
+            raise ValueError('No path exists between start and end of maze.')
+
+        # Step back from end to any consistent neighbour one move closer to start.
+        with self.metrics.phase('path_reconstruction'):
+            self.solution = []
+            node = self._end_node
+            while distances[node] > 1:
+                previous = next((node + offset for offset in self._offsets
+                                 if walkable[node + offset] and distances[node + offset] == distances[node] - 1
+                                 and distances[node + offset] == lookaheads[node + offset]), None)
+
+                if previous is None:
+                    self.solution = None
+                    raise ValueError('No path exists between start and end of maze.')
+
+                node = previous
+                self.solution.append(Cell(*divmod(node, self._width)))
+
+        return self
+
+    def _render_maze_image(self):
+        image = super()._render_maze_image()
+
+        for (row, col), state in self._edited_cells.items():
+            image.putpixel((col, row), self.colors[state])
+
+        return image
@@ -1,12 +1,20 @@
 # -*- coding: utf-8 -*-
 
 
+import os
 from abc import ABC, abstractmethod
 from collections import namedtuple
 from enum import IntEnum
-from time import time
 
-from PIL import Image, ImageCms
+import numpy as np
+
+from generators.generator import PixelState, COLORS_DICT
+from generators.maps import Map
+from generators.maze_file import MazeFile
+from metrics import MetricsCollector
+
+from .colors import choose_different_color
+from .junction_graph import JunctionGraph
 
 
 # Define constants for possible cell states represented by each pixel.
@@ -15,62 +23,164 @@ CellState = IntEnum('CellState', ['WALL', 'FREE', 'START', 'END', 'SOLUTION'])
 # Define namedtuple used to identify cell and access its attributes without indexing.
 Cell = namedtuple('Cell', ['row', 'col'])
 
+# Cell state corresponding to each pixel state of mazes rendered from maze files.
+PIXEL_STATE_TO_CELL_STATE = {PixelState.WALL: CellState.WALL, PixelState.FREE: CellState.FREE,
+                             PixelState.START: CellState.START, PixelState.END: CellState.END}
+
 
 class Solver(ABC):
     """
     Abstract class implementing a maze solving algorithm. The input maze is read from an image,
     a suitable color is chosen to draw solution, and finally an output image with the solution
-    draw on top is saved.
+    draw on top is saved. The input maze can also be read from a maze file in native binary format
+    (.maze extension), in which case no image decoding takes place, or given directly as a map
+    freshly generated, in which case nothing is read from disk.
+    Optionally, corridors can be contracted so that search runs on a weighted graph of junctions,
+    which is cached next to the input maze for repeated solves.
     """
 
     def __init__(self):
         self.input_image_path = None
         self.dimentions = None
         self.solution = None
+        self._maze_array = None
+
+        # Number of nodes expanded by last search, used to compare how much of the maze algorithms explore.
+        self.nodes_expanded = 0
+
+        # Collector of phases timings and counters of runs, which prints them by default.
+        self.metrics = MetricsCollector()
+
+    def solve(self, maze, contract_corridors = False, start = None, end = None, verbose = True):
+        """
+        Solves a maze given as the path of an image or maze file, or as a generators.maps.Map or its walls
+        array, in which case start and end cells of the maze must be given and nothing is read from disk.
+        Time spent in each phase and counters of the search are sent to the sinks of the metrics collector.
+        """
+
+        if contract_corridors and not self.supports_contracted_corridors():
+            raise NotImplementedError(f'{type(self).__name__} does not support solving on contracted corridors.')
+
+        metrics = self.metrics
+        with metrics.run('solve', f'Solved maze with {type(self).__name__}', verbose, algorithm = type(self).__name__):
+            if isinstance(maze, (Map, np.ndarray)):
+                if start is None or end is None:
+                    raise ValueError('Start and end of maze must be given when solving a map.')
+
+                self.input_image_path = None
+                maze_map = maze if isinstance(maze, Map) else Map.from_walls(maze)
+                with metrics.phase('decode'):
+                    array, start, end = self._load_map(maze_map, Cell(*start), Cell(*end))
+
+            elif os.fspath(maze).lower().endswith('.maze'):
+                self.input_image_path = maze
+
+                if verbose:
+                    print('Loading maze file...')
+                with metrics.phase('decode'):
+                    array, start, end = self._load_maze_file(maze)
+            else:
+                self.input_image_path = maze
+                self._maze_array = None
+                with metrics.phase('decode'):
+                    # Pillow is only imported once an image is read, which keeps solving maze files and maps cheap.
+                    from PIL import Image
+                    image = Image.open(self.input_image_path).convert('RGB')
+
+                if verbose:
+                    print('Analysing image...')
+                with metrics.phase('colour_analysis'):
+                    self.colors = self._analyse_image_colors(image)
+                with metrics.phase('image_to_array'):
+                    array, start, end = self._image_to_array(image, self.colors)
+
+            height, width = array.shape
+            description = f'{height}x{width} maze'
+
+            if contract_corridors:
+                if verbose:
+                    print('Contracting corridors...')
+                with metrics.phase('contraction'):
+                    if self.input_image_path is None:
+                        graph = JunctionGraph.from_walkable_mask(array != CellState.WALL, start, end)
+                    else:
+                        graph = JunctionGraph.for_file(self.input_image_path, array != CellState.WALL, start, end)
+                description += f' contracted to {graph.num_nodes} junctions'
+
+            if verbose:
+                print(f'Solving {description} with {type(self).__name__}...')
+
+            # Solvers time reconstruction of the path as a phase of its own, nested in search.
+            with metrics.phase('search'):
+                if contract_corridors:
+                    self._solve_graph_implementation(graph, start, end)
+                else:
+                    self._solve_implementation(array, start, end)
+
+            metrics.count('nodes_expanded', self.nodes_expanded)
+            metrics.update(label = f'Solved {description} with {type(self).__name__}', height = height, width = width)
 
-    def solve(self, image_path):
-        self.input_image_path = image_path
+        return self
 
-        image = Image.open(self.input_image_path).convert('RGB')
+    def _load_maze_file(self, file_path):
+        maze_file = MazeFile(file_path)
 
-        print('Analysing image...')
-        self.colors = self._analyse_image_colors(image)
-        array, start, end = self._image_to_array(image, self.colors)
+        return self._load_map(maze_file.load_map(), maze_file.start, maze_file.end)
 
-        print(f'Solving {image.height}x{image.width} maze with {type(self).__name__}...')
-        start_time = time()
-        self._solve_implementation(array, start, end)
-        print(f'Solved {image.height}x{image.width} maze with {type(self).__name__} in {time()-start_time:.5f} seconds.')
+    def _load_map(self, maze_map, start, end):
+        """
+        Converts a map and its start and end cells into a uint8 array of CellState values, with start and end
+        in pixels, written in a single pass over the walls. The array is kept to draw the solution without any
+        image to read. It takes one byte per pixel, about 4 bytes per cell, on top of the walls of the map.
+        """
 
-        return self
+        for name, cell in (('Start', start), ('End', end)):
+            if not (0 <= cell.row < maze_map.map_rows and 0 <= cell.col < maze_map.map_cols):
+                raise ValueError(f'{name} cell {tuple(cell)} of maze is outside of its {maze_map.map_rows}x{maze_map.map_cols} cells.')
+
+        array = np.full((2*maze_map.map_rows+1, 2*maze_map.map_cols+1), CellState.WALL, dtype = np.uint8)
+
+        # Pixels with both coordinates odd are cells, pixels right below or right of them are the walls between cells.
+        # As CellState.WALL is CellState.FREE - 1, wall pixels are FREE minus the wall value, written without any mask.
+        array[1::2, 1::2] = CellState.FREE
+        np.subtract(CellState.FREE, maze_map.get_walls_down(),  out = array[2::2, 1::2], casting = 'unsafe')
+        np.subtract(CellState.FREE, maze_map.get_walls_right(), out = array[1::2, 2::2], casting = 'unsafe')
+
+        start = Cell(2*start.row+1, 2*start.col+1)
+        end   = Cell(2*end.row  +1, 2*end.col  +1)
+        array[start] = CellState.START
+        array[end]   = CellState.END
+
+        self._maze_array = array
+
+        self.colors = {cell_state: COLORS_DICT[pixel_state] for pixel_state, cell_state in PIXEL_STATE_TO_CELL_STATE.items()}
+        self.colors[CellState.SOLUTION] = self._choose_different_color(self.colors.values())
+
+        return array, start, end
 
     @abstractmethod
     def _solve_implementation(self, array, start, end):
         raise NotImplementedError
 
-    def _choose_different_color(self, colors):
-        # Convert colors to CIELAB colorspace.
-        profile_rgb = ImageCms.createProfile("sRGB")
-        profile_lab = ImageCms.createProfile("LAB")
+    @classmethod
+    def supports_contracted_corridors(cls):
+        """Returns whether the algorithm of the solver can run on a graph of contracted corridors."""
 
-        rgb_to_lab_transform = ImageCms.buildTransformFromOpenProfiles(profile_rgb, profile_lab, "RGB", "LAB")
-    
-        convert_rgb_to_lab = lambda rgb_color: ImageCms.applyTransform(Image.new("RGB", (1, 1), color = rgb_color), rgb_to_lab_transform).getpixel((0, 0))
+        return cls._solve_graph_implementation is not Solver._solve_graph_implementation
 
-        lab_colors = [convert_rgb_to_lab(color) for color in colors]
+    def _solve_graph_implementation(self, graph, start, end):
+        raise NotImplementedError(f'{type(self).__name__} does not support solving on contracted corridors.')
 
-        # Compute CIE76 Delta E between each possible RGB color and each existing color.
-        # Sum distances for each possible rgb color computed over existing colors. 
-        color_distances = {}
-        possible_channel_values = list(range(0, 256, 10)) + [255]
-        for red in possible_channel_values:
-            for green in possible_channel_values:
-                for blue in possible_channel_values:
-                    l, a, b = convert_rgb_to_lab((red, green, blue))
+    def _set_solution_from_graph_path(self, graph, nodes):
+        """Sets solution from a path of consecutive graph nodes going from start to end."""
 
-                    color_distances[(red, green, blue)] = sum(((l - l_e)**2 + (a - a_e)**2 + (b - b_e)**2)**0.5 for l_e, a_e, b_e in lab_colors)
+        pixels = graph.expand_path(nodes)
 
-        return max(color_distances, key = color_distances.get)
+        # Remove start and end from solution.
+        self.solution = [Cell(*divmod(pixel, graph.width)) for pixel in pixels[1:-1]]
+
+    def _choose_different_color(self, colors):
+        return choose_different_color(colors)
 
     def _analyse_image_colors(self, image):
         colors = {}
@@ -81,41 +191,42 @@ class Solver(ABC):
         # Any cell with both coordinates odd is always free.
         colors[CellState.FREE] = image.getpixel((1, 1))
 
-        all_colors_image = set(image.getdata())
+        # Colors are counted by Pillow in a single pass, which returns None if there are more than 4 of them.
+        all_colors_image = image.getcolors(maxcolors = 4)
 
         # If more colors than one for each of wall, free, start and end are detected, image is invalid (possibly has been compressed with loss)
         # and cell states can't be determined accurately from image pixels. 
-        if len(all_colors_image) != 4:
+        if all_colors_image is None or len(all_colors_image) != 4:
             raise ValueError('Image is invalid: incorrect number of different colors detected. This may be due to use of a lossy image format.')
 
-        colors[CellState.START], colors[CellState.END] =  list(all_colors_image - set(colors.values()))
+        colors[CellState.START], colors[CellState.END] = [color for _, color in all_colors_image if color not in colors.values()]
 
         colors[CellState.SOLUTION] = self._choose_different_color(colors.values())
 
         return colors
 
     def _image_to_array(self, image, colors):
-        colors_to_state_dict = {v: k for k, v in colors.items()}
-
-        array = [[None for _ in range(image.width)] for _ in range(image.height)]
-        start = None
-        end = None
+        """
+        Converts image into a uint8 array of CellState values. Each pixel is viewed as a single 32 bits integer
+        and all pixels of each color are found with one vectorized comparison.
+        """
 
-        for col in range(image.width):
-            for row in range(image.height):
-                cell_type = colors_to_state_dict[image.getpixel((col, row))]
+        # Colors are packed the same way as pixels, so that both views share the same byte order.
+        states = [CellState.FREE, CellState.START, CellState.END]
+        codes = np.array([(*colors[state], 255) for state in states], dtype = np.uint8).view(np.uint32).ravel()
+        pixels = np.asarray(image.convert('RGBA')).view(np.uint32)[:, :, 0]
 
-                array[row][col] = cell_type
+        array = np.full(pixels.shape, CellState.WALL, dtype = np.uint8)
+        for state, code in zip(states, codes):
+            array[pixels == code] = state
 
-                if cell_type == CellState.START:
-                    start = Cell(row, col)
-                elif cell_type == CellState.END:
-                    end = Cell(row, col)
+        start = Cell(*divmod(int(np.flatnonzero(array == CellState.START)[0]), image.width))
+        end   = Cell(*divmod(int(np.flatnonzero(array == CellState.END  )[0]), image.width))
 
         return array, start, end
 
     def _is_walkable_cell(self, array, cell):
-        return array[cell.row][cell.col] != CellState.WALL
+        return array[cell.row, cell.col] != CellState.WALL
 
     def _get_neighbours(self, cell):
         """Returns a list of tuples of form (distance, neighbour)."""
@@ -125,14 +236,32 @@ class Solver(ABC):
                 (1, Cell(cell.row, cell.col + 1)),
                 (1, Cell(cell.row, cell.col - 1))]
 
-    def save_solution_as_img(self, image_path):
+    def _render_maze_image(self):
+        """Returns an RGB image of the solved maze, without its solution."""
+
+        from PIL import Image
+
+        if self._maze_array is not None:
+            colors = np.zeros((len(CellState) + 1, 3), dtype = np.uint8)
+            for cell_state, color in self.colors.items():
+                colors[cell_state] = color
+
+            return Image.fromarray(colors[self._maze_array])
+
+        return Image.open(self.input_image_path).convert('RGB')
+
+    def save_solution_as_img(self, image_path, verbose = True):
         
         if self.solution is None:
             raise RuntimeError("save_solution_as_img method called before generate method.")
 
-        image = Image.open(self.input_image_path).convert('RGB')
+        metrics = self.metrics
+        with metrics.run('save', f'Saved solution to {image_path}', verbose, algorithm = type(self).__name__):
+            with metrics.phase('render'):
+                image = self._render_maze_image()
 
-        for row, col in self.solution:
-            image.putpixel((col, row), self.colors[CellState.SOLUTION])
+                for row, col in self.solution:
+                    image.putpixel((col, row), self.colors[CellState.SOLUTION])
 
-        image.save(image_path)
\ No newline at end of file
+            with metrics.phase('encode'):
+                image.save(image_path)
\ No newline at end of file
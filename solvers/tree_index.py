@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+import numpy as np
+
+from generators.maps import Map, WallOrient
+from generators.maze_file import MazeFile
+
+from .solver import Cell
+
+
+class MazeTree:
+    """
+    Class answering many path queries on the same perfect maze. As a perfect maze is a spanning tree over
+    its cells, the tree is rooted once and indexed with binary lifting tables. The length of the path
+    between any two cells is then found in O(log n) from the depth of their lowest common ancestor,
+    and the path itself in O(path length) by walking up from both cells to that ancestor.
+    Cells are maze cells (not pixels), and lengths are numbers of moves between adjacent cells.
+    """
+
+    def __init__(self, maze_map):
+        self.dimention = (maze_map.map_rows, maze_map.map_cols)
+        num_cells = maze_map.map_rows * maze_map.map_cols
+
+        parents, depths = self._root_tree(maze_map)
+
+        # Ancestors of each cell 2**level steps above it. Root is its own parent.
+        ancestors = [parents]
+        max_depth = int(depths.max())
+        while (1 << len(ancestors)) <= max_depth:
+            ancestors.append(ancestors[-1][ancestors[-1]])
+
+        # Memoryviews provide much faster access to single elements than the arrays themselves.
+        self._ancestors = [memoryview(level) for level in ancestors]
+        self._parents = self._ancestors[0]
+        self._depths = memoryview(depths)
+        self.num_cells = num_cells
+
+    @classmethod
+    def from_file(cls, maze_path):
+        """
+        Builds the index of a maze read from a maze file (.maze extension) or from an image.
+        """
+
+        if os.fspath(maze_path).lower().endswith('.maze'):
+            return cls(MazeFile(maze_path).load_map())
+
+        # Pillow is only imported once an image is read, which keeps indexing maze files cheap.
+        from PIL import Image
+
+        # Only walls matter: pixels with the color of the top-left pixel are walls, all others are walkable.
+        image = Image.open(maze_path).convert('RGBA')
+        pixels = np.asarray(image).view(np.uint32)[:, :, 0]
+        walkable = pixels != pixels[0, 0]
+
+        walls = np.ones((len(WallOrient), pixels.shape[0] // 2 + 1, pixels.shape[1] // 2 + 1), dtype = bool)
+        maze_map = Map.from_walls(walls)
+        maze_map.get_walls_down()[:]  = ~walkable[2::2, 1::2]
+        maze_map.get_walls_right()[:] = ~walkable[1::2, 2::2]
+
+        return cls(maze_map)
+
+    @staticmethod
+    def _root_tree(maze_map):
+        """
+        Roots the spanning tree formed by the maze at cell 0 with a breadth-first traversal, returning
+        parent and depth of each cell. Raises ValueError if the maze is not perfect.
+        """
+
+        map_cols = maze_map.map_cols
+        num_cells = maze_map.map_rows * map_cols
+
+        down_open  = (~maze_map.get_walls_down()).tobytes()
+        right_open = (~maze_map.get_walls_right()).tobytes()
+
+        parents = np.full(num_cells, -1, dtype = np.int32)
+        depths = np.zeros(num_cells, dtype = np.int32)
+        parents_view, depths_view = memoryview(parents), memoryview(depths)
+
+        parents_view[0] = 0
+        leaves = [0]
+        num_reached = 1
+
+        while leaves:
+            new_leaves = []
+
+            for cell in leaves:
+                # Right wall of last cell of a row is a border wall, so left neighbour of first cell of next
+                # row is never considered open.
+                neighbours = []
+                if down_open[cell]:
+                    neighbours.append(cell + map_cols)
+                if cell >= map_cols and down_open[cell - map_cols]:
+                    neighbours.append(cell - map_cols)
+                if right_open[cell]:
+                    neighbours.append(cell + 1)
+                if cell >= 1 and right_open[cell - 1]:
+                    neighbours.append(cell - 1)
+
+                for neighbour in neighbours:
+                    if neighbour == parents_view[cell]:
+                        continue
+
+                    if parents_view[neighbour] != -1:
+                        raise ValueError('Maze is not perfect: it contains a loop.')
+
+                    parents_view[neighbour] = cell
+                    depths_view[neighbour] = depths_view[cell] + 1
+                    new_leaves.append(neighbour)
+
+            num_reached += len(new_leaves)
+            leaves = new_leaves
+
+        if num_reached != num_cells:
+            raise ValueError('Maze is not perfect: some cells are unreachable.')
+
+        return parents, depths
+
+    def _cell_id(self, cell):
+        row, col = cell
+        map_rows, map_cols = self.dimention
+
+        if not (0 <= row < map_rows and 0 <= col < map_cols):
+            raise IndexError(f'Cell {(row, col)} out of maze bounds.')
+
+        return row * map_cols + col
+
+    def _lowest_common_ancestor(self, cell_a, cell_b):
+        ancestors, depths = self._ancestors, self._depths
+
+        if depths[cell_a] < depths[cell_b]:
+            cell_a, cell_b = cell_b, cell_a
+
+        # Bring deepest cell to the depth of the other one.
+        depth_difference = depths[cell_a] - depths[cell_b]
+        level = 0
+        while depth_difference:
+            if depth_difference & 1:
+                cell_a = ancestors[level][cell_a]
+            depth_difference >>= 1
+            level += 1
+
+        if cell_a == cell_b:
+            return cell_a
+
+        # Climb both cells as long as their ancestors differ.
+        for level in reversed(range(len(ancestors))):
+            if ancestors[level][cell_a] != ancestors[level][cell_b]:
+                cell_a = ancestors[level][cell_a]
+                cell_b = ancestors[level][cell_b]
+
+        return ancestors[0][cell_a]
+
+    def path_length(self, start, end):
+        """Returns the number of moves on the path from start to end, given as (row, col) cells."""
+
+        cell_a, cell_b = self._cell_id(start), self._cell_id(end)
+        ancestor = self._lowest_common_ancestor(cell_a, cell_b)
+
+        return self._depths[cell_a] + self._depths[cell_b] - 2 * self._depths[ancestor]
+
+    def path(self, start, end):
+        """Returns the list of cells on the path from start to end, both included."""
+
+        cell_a, cell_b = self._cell_id(start), self._cell_id(end)
+        ancestor = self._lowest_common_ancestor(cell_a, cell_b)
+
+        path_up = [cell_a]
+        while path_up[-1] != ancestor:
+            path_up.append(self._parents[path_up[-1]])
+
+        path_down = []
+        cell = cell_b
+        while cell != ancestor:
+            path_down.append(cell)
+            cell = self._parents[cell]
+
+        map_cols = self.dimention[1]
+        return [Cell(*divmod(cell, map_cols)) for cell in path_up + path_down[::-1]]
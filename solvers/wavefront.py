@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+
+import numpy as np
+
+
+# Direction from which no pixel was reached, used for the source and unreachable pixels.
+NO_DIRECTION = 255
+
+
+def propagate_wavefront(walkable, source, target = None):
+    """
+    Function running Breadth-First-Search from the source pixel over a 2D boolean walkable mask, advancing
+    the whole frontier at each step with array operations on flat pixel ids. Returns the distance of each
+    pixel from source (-1 if unreachable) and the index of the move in (down, up, right, left) which reached
+    it, both with the shape of the mask. If a target pixel is given, propagation stops once it is reached,
+    otherwise the full distance field is computed. The mask must be surrounded by non walkable pixels.
+    """
+
+    height, width = walkable.shape
+    offsets = (width, -width, 1, -1)
+
+    walkable = walkable.ravel()
+    distances = np.full(height * width, -1, dtype = np.int32)
+    directions = np.full(height * width, NO_DIRECTION, dtype = np.uint8)
+
+    source_node = source[0] * width + source[1]
+    target_node = None if target is None else target[0] * width + target[1]
+
+    distances[source_node] = 0
+    frontier = np.array([source_node], dtype = np.intp)
+    step = 0
+
+    while frontier.size and (target_node is None or distances[target_node] < 0):
+        step += 1
+        new_frontier = []
+
+        # Each pixel is reached once per direction at most, and is claimed by the first direction reaching it.
+        for direction, offset in enumerate(offsets):
+            neighbours = frontier + offset
+            neighbours = neighbours[walkable[neighbours] & (distances[neighbours] < 0)]
+
+            distances[neighbours] = step
+            directions[neighbours] = direction
+            new_frontier.append(neighbours)
+
+        frontier = np.concatenate(new_frontier)
+
+    return distances.reshape(height, width), directions.reshape(height, width)